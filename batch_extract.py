@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import time
+import hashlib
+import argparse
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
+from extract_solution import extract_solution
+
+def extract_record(item, field='response'):
+    """Run extract_solution on one JSONL record and describe the result."""
+    index, offset, line = item
+    result = {
+        'index': index,
+        'offset': offset,
+        'next_offset': offset + len(line),
+        'files': [],
+        'error': None,
+    }
+
+    try:
+        record = json.loads(line)
+        for key in ('request_id', 'id'):
+            if key in record:
+                result[key] = record[key]
+                break
+
+        for file_name, code in extract_solution(record[field]):
+            data = code.encode('utf-8')
+            result['files'].append({
+                'path': file_name,
+                'size': len(data),
+                'sha256': hashlib.sha256(data).hexdigest(),
+            })
+    except KeyError:
+        result['error'] = f"Missing field '{field}'"
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+
+    return result
+
+def read_records(input_file, start_offset=0, start_index=0):
+    """Yield (index, offset, line) for each non-empty line, starting at start_offset."""
+    with open(input_file, 'rb') as f:
+        f.seek(start_offset)
+        offset = start_offset
+        index = start_index
+        for line in f:
+            if line.strip():
+                yield index, offset, line
+                index += 1
+            offset += len(line)
+
+def resume_position(output_file):
+    """Return (next_offset, next_index) of the last completed record in output_file.
+
+    A trailing partial line left behind by a crash is truncated away.
+    """
+    if not os.path.exists(output_file):
+        return 0, 0
+
+    next_offset, next_index = 0, 0
+    valid_size = 0
+    with open(output_file, 'rb+') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                result = json.loads(line)
+            except ValueError:
+                break
+            next_offset, next_index = result['next_offset'], result['index'] + 1
+            valid_size += len(line)
+        f.truncate(valid_size)
+
+    return next_offset, next_index
+
+def _batches(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def run_batch(input_file, output_file, field='response', workers=None,
+              chunksize=16, resume=False, report_every=5.0):
+    """Extract every record of input_file in a process pool, writing results in input order."""
+    workers = workers or os.cpu_count() or 1
+
+    if resume:
+        start_offset, start_index = resume_position(output_file)
+        mode = 'a'
+    else:
+        start_offset, start_index = 0, 0
+        mode = 'w'
+
+    if start_offset:
+        print(f"Resuming at record {start_index} (byte offset {start_offset})")
+
+    worker = partial(extract_record, field=field)
+    records = read_records(input_file, start_offset, start_index)
+
+    count = errors = 0
+    started = last_report = time.monotonic()
+    with open(output_file, mode, encoding='utf-8') as output, \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+        # Submit bounded batches so huge inputs are never held in memory at once
+        for batch in _batches(records, chunksize * workers * 4):
+            for result in executor.map(worker, batch, chunksize=chunksize):
+                output.write(json.dumps(result) + '\n')
+                count += 1
+                errors += result['error'] is not None
+            output.flush()
+
+            now = time.monotonic()
+            if now - last_report >= report_every:
+                print(f"{count} records, {count / (now - started):.1f} records/s")
+                last_report = now
+
+    elapsed = time.monotonic() - started
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"Processed {count} records ({errors} errors) in {elapsed:.2f}s, {rate:.1f} records/s")
+    return count, errors
+
+def main():
+    parser = argparse.ArgumentParser(description='Run extract_solution over a JSONL file of responses.')
+    parser.add_argument('input', help='JSONL file with one response record per line')
+    parser.add_argument('--output', default='extraction_results.jsonl', help='Output JSONL path (default: extraction_results.jsonl)')
+    parser.add_argument('--field', default='response', help='Record field holding the LLM response (default: response)')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes (default: CPU count)')
+    parser.add_argument('--chunksize', type=int, default=16, help='Records sent to a worker at a time (default: 16)')
+    parser.add_argument('--resume', action='store_true', help='Continue after the last record completed in --output')
+
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.input):
+        print(f"Error: Input '{args.input}' does not exist.")
+        return
+
+    run_batch(args.input, args.output, field=args.field, workers=args.workers,
+              chunksize=args.chunksize, resume=args.resume)
+    print(f"Output written to: {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+
+from extract_solution import extract_code_blocks, extract_code_spans, extract_solution
+from extract_solution_test import llm_response
+
+LANGUAGES = ["typescript", "tsx"]
+
+# Size multipliers used to check that extraction time grows linearly
+SCALES = [1, 2, 4, 8]
+
+FIXTURE_BLOCKS = extract_solution(llm_response)
+
+def _render(blocks, newline='\n'):
+    parts = []
+    for i, (lang, file_name, code) in enumerate(blocks):
+        parts.append(f"Step {i}: here is `{file_name}`.\n\n```{lang}\n// {file_name}\n{code}\n```\n\n")
+    return ''.join(parts).replace('\n', newline)
+
+def _fixture_blocks(count, prefix='gen'):
+    """Yields (lang, file_name, code) for count files copied from the fixture."""
+    for i in range(count):
+        file_name, code = FIXTURE_BLOCKS[i % len(FIXTURE_BLOCKS)]
+        lang = 'typescript' if file_name.endswith('.ts') else 'tsx'
+        yield lang, file_name.replace('src/', f'src/{prefix}{i}/', 1), code
+
+def _files_for(size):
+    average = len(llm_response) / len(FIXTURE_BLOCKS)
+    return max(1, int(size / average))
+
+def build_fixture(size):
+    """The realistic response from extract_solution_test.py, repeated."""
+    return llm_response * max(1, size // len(llm_response))
+
+def build_many_files(size):
+    """Hundreds of distinct files, each with its own path."""
+    return _render(_fixture_blocks(_files_for(size)))
+
+def build_unclosed(size):
+    """Regular files followed by a fence that is never closed."""
+    text = _render(_fixture_blocks(_files_for(size)))
+    return text + "```tsx\n// src/Truncated.tsx\n" + FIXTURE_BLOCKS[0][1][:2000]
+
+def build_stray_backticks(size):
+    """Prose with thousands of triple backticks that do not open a block."""
+    prose = "Use ``` to fence code, not ```` or `` ` ``; ```tsx without a newline is text ```.\n"
+    text = _render(_fixture_blocks(_files_for(size // 2)))
+    return prose * max(1, (size - len(text)) // len(prose)) + text
+
+def build_crlf(size):
+    """Windows line endings throughout."""
+    return _render(_fixture_blocks(_files_for(size)), newline='\r\n')
+
+def build_mixed_languages(size):
+    """typescript/tsx blocks interleaved with css, json and unlisted languages."""
+    others = [
+        ('css', 'src/index.css', '.app { display: flex; }\n' * 20),
+        ('json', 'src/data.json', '{"items": [1, 2, 3]}\n' * 20),
+        ('', 'notes.txt', 'plain fenced text\n' * 20),
+        ('jsx', 'src/Legacy.jsx', 'export const Legacy = () => <div />;\n' * 20),
+    ]
+    blocks = []
+    for i, block in enumerate(_fixture_blocks(_files_for(size))):
+        blocks.append(block)
+        blocks.append(others[i % len(others)])
+    return _render(blocks)
+
+SCENARIOS = {
+    'fixture': build_fixture,
+    'many_files': build_many_files,
+    'large': build_fixture,
+    'unclosed': build_unclosed,
+    'stray_backticks': build_stray_backticks,
+    'crlf': build_crlf,
+    'mixed_languages': build_mixed_languages,
+}
+
+FUNCTIONS = {
+    'extract_code_blocks': lambda text: extract_code_blocks(text, LANGUAGES),
+    'extract_code_spans': lambda text: extract_code_spans(text, LANGUAGES),
+    'extract_solution': extract_solution,
+}
+
+def time_call(func, text, repeat):
+    """Returns the best wall-clock time of func(text) over repeat runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def peak_memory(func, text):
+    """Returns the peak bytes allocated by func(text), the input excluded."""
+    tracemalloc.start()
+    try:
+        func(text)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run_scenario(name, max_size, repeat, tolerance):
+    """Times every function on the scenario at increasing sizes up to max_size."""
+    builder = SCENARIOS[name]
+    texts = [builder(max_size * scale // SCALES[-1]) for scale in SCALES]
+    report = {'scenario': name, 'functions': {}}
+
+    for func_name, func in FUNCTIONS.items():
+        runs = []
+        for text in texts:
+            seconds = time_call(func, text, repeat)
+            size = len(text.encode('utf-8'))
+            runs.append({
+                'bytes': size,
+                'blocks': len(func(text)),
+                'seconds': seconds,
+                'mb_per_s': size / seconds / 1e6 if seconds else None,
+            })
+        # Peak memory is only measured on the largest input, tracing is slow
+        runs[-1]['peak_memory_bytes'] = peak_memory(func, texts[-1])
+
+        first, last = runs[0], runs[-1]
+        growth = (last['seconds'] / first['seconds']) / (last['bytes'] / first['bytes'])
+        report['functions'][func_name] = {
+            'runs': runs,
+            'growth': growth,
+            'linear': growth <= tolerance,
+        }
+
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark extract_solution on adversarial and large synthetic responses.')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS), help='Scenario to run (default: all)')
+    parser.add_argument('--size-mb', type=float, default=4, help='Largest input size for regular scenarios in MB (default: 4)')
+    parser.add_argument('--large-mb', type=float, default=50, help="Largest input size for the 'large' scenario in MB (default: 50)")
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per input, the best is kept (default: 3)')
+    parser.add_argument('--tolerance', type=float, default=2.0, help='Allowed time growth over size growth before failing (default: 2.0)')
+    parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    args = parser.parse_args()
+
+    reports = []
+    for name in args.scenario or list(SCENARIOS):
+        size_mb = args.large_mb if name == 'large' else args.size_mb
+        print(f"Running scenario '{name}' up to {size_mb} MB...", file=sys.stderr)
+        reports.append(run_scenario(name, int(size_mb * 1e6), args.repeat, args.tolerance))
+
+    regressions = [
+        f"{report['scenario']}/{func_name}"
+        for report in reports
+        for func_name, result in report['functions'].items()
+        if not result['linear']
+    ]
+    output = json.dumps({'scenarios': reports, 'non_linear': regressions}, indent=2)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+        print(f"Report written to: {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    if regressions:
+        print(f"Non-linear extraction time: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import fcntl
+import shutil
+import hashlib
+import argparse
+import platform
+import subprocess
+
+DEFAULT_STORE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'node_modules_store')
+
+LINK_MODES = ['symlink', 'reflink', 'hardlink']
+
+def lockfile_key(project_dir: str) -> str:
+    """Hashes package-lock.json together with the platform native modules are built for."""
+    digest = hashlib.sha256(f"{sys.platform}-{platform.machine()}\0".encode('utf-8'))
+    with open(os.path.join(project_dir, 'package-lock.json'), 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:32]
+
+class DependencyStore:
+    """Content-addressed node_modules trees keyed by lockfile hash.
+
+    Each lockfile is installed with `npm ci` once; workspaces are then
+    populated by linking to the stored tree instead of installing again.
+    """
+
+    def __init__(self, root: str = None):
+        self.root = os.path.abspath(root or os.environ.get('NODE_MODULES_STORE', DEFAULT_STORE_DIR))
+        os.makedirs(self.root, exist_ok=True)
+
+    def entry(self, key: str) -> str:
+        return os.path.join(self.root, key, 'node_modules')
+
+    def ensure(self, project_dir: str) -> str:
+        """Returns the stored node_modules for project_dir's lockfile, installing it if needed."""
+        key = lockfile_key(project_dir)
+        node_modules = self.entry(key)
+        if os.path.isdir(node_modules):
+            os.utime(os.path.dirname(node_modules))
+            return node_modules
+
+        # Only one process installs a given lockfile, the others wait for it
+        with open(os.path.join(self.root, f".{key}.lock"), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if os.path.isdir(node_modules):
+                return node_modules
+
+            staging = os.path.join(self.root, f".staging-{key}-{os.getpid()}")
+            shutil.rmtree(staging, ignore_errors=True)
+            os.makedirs(staging)
+            try:
+                for name in ('package.json', 'package-lock.json'):
+                    shutil.copy2(os.path.join(project_dir, name), staging)
+                print(f"Installing dependencies for lockfile {key}...")
+                subprocess.run(['npm', 'ci', '--no-audit', '--no-fund'], cwd=staging, check=True)
+                os.rename(staging, os.path.dirname(node_modules))
+            except BaseException:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+
+        return node_modules
+
+    def populate(self, workspace: str, project_dir: str = None, mode: str = 'symlink') -> str:
+        """Makes the stored dependencies available as workspace/node_modules.
+
+        Args:
+            workspace: Directory that receives node_modules.
+            project_dir: Directory holding the lockfile (default: workspace).
+            mode: 'symlink' (instant, tree shared read-only), 'reflink'
+                (copy-on-write clone, falls back to 'hardlink') or 'hardlink'.
+
+        Returns:
+            The mode actually used.
+        """
+        source = self.ensure(project_dir or workspace)
+        target = os.path.join(workspace, 'node_modules')
+        if os.path.islink(target) or os.path.isfile(target):
+            os.unlink(target)
+        elif os.path.isdir(target):
+            shutil.rmtree(target)
+
+        if mode == 'symlink':
+            os.symlink(source, target)
+            return mode
+
+        if mode == 'reflink':
+            result = subprocess.run(['cp', '-R', '--reflink=always', source, target],
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if result.returncode == 0:
+                return mode
+            # The filesystem does not support reflinks
+            shutil.rmtree(target, ignore_errors=True)
+
+        shutil.copytree(source, target, symlinks=True, copy_function=os.link)
+        return 'hardlink'
+
+    def prune(self, keep: int = 5) -> list[str]:
+        """Removes all but the keep most recently used entries; returns the removed keys."""
+        entries = []
+        for entry in os.scandir(self.root):
+            if entry.is_dir() and not entry.name.startswith('.'):
+                entries.append((entry.stat().st_mtime, entry.name))
+
+        removed = []
+        for _, key in sorted(entries, reverse=True)[keep:]:
+            shutil.rmtree(os.path.join(self.root, key), ignore_errors=True)
+            removed.append(key)
+        return removed
+
+def main():
+    parser = argparse.ArgumentParser(description='Populate node_modules from a shared, lockfile-keyed store.')
+    parser.add_argument('workspace', nargs='+', help='Directories that need node_modules')
+    parser.add_argument('--project', default=None, help='Directory holding package-lock.json (default: each workspace)')
+    parser.add_argument('--store', default=None, help=f'Store directory (default: $NODE_MODULES_STORE or {DEFAULT_STORE_DIR})')
+    parser.add_argument('--mode', choices=LINK_MODES, default='symlink', help='How node_modules is linked (default: symlink)')
+
+    args = parser.parse_args()
+
+    store = DependencyStore(args.store)
+    for workspace in args.workspace:
+        project_dir = args.project or workspace
+        if not os.path.isfile(os.path.join(project_dir, 'package-lock.json')):
+            print(f"Error: No package-lock.json in '{project_dir}'.")
+            sys.exit(1)
+        mode = store.populate(workspace, project_dir, args.mode)
+        print(f"Populated {workspace}/node_modules ({mode})")
+
+if __name__ == "__main__":
+    main()
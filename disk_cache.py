@@ -0,0 +1,127 @@
+import os
+import fcntl
+import tempfile
+from contextlib import contextmanager
+
+class DiskCache:
+    """A size-bounded on-disk key -> bytes cache shared between processes.
+
+    Entries are written through a temporary file and a rename, so readers
+    never see partial values. Reads refresh an entry's mtime, and eviction
+    removes the least recently used entries once the cache grows past
+    max_bytes. Eviction is serialized with a lock file.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._written = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key: str) -> bytes | None:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = f.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another process since we read it
+            pass
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(value)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        # Scanning the cache is costly, so only check its size now and then
+        self._written += len(value)
+        if self._written >= self.max_bytes // 16:
+            self._written = 0
+            self.evict()
+
+    def acquire(self, key: str, blocking: bool = True):
+        """Takes the lock of key; close the returned file to release it.
+
+        With blocking=False, raises BlockingIOError if another holder has it.
+        """
+        directory = os.path.join(self.directory, '.locks')
+        os.makedirs(directory, exist_ok=True)
+        lock = open(os.path.join(directory, key), 'a')
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BaseException:
+            lock.close()
+            raise
+        return lock
+
+    @contextmanager
+    def lock(self, key: str):
+        """Holds the lock of key, e.g. while its value is being computed."""
+        lock = self.acquire(key)
+        try:
+            yield
+        finally:
+            lock.close()
+
+    def delete(self, key: str) -> None:
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def evict(self) -> int:
+        """Removes least recently used entries until the cache fits; returns the count removed."""
+        with open(os.path.join(self.directory, '.lock'), 'a') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # Another process is already evicting
+                return 0
+
+            entries = []
+            total = 0
+            for entry in os.scandir(self.directory):
+                if not entry.is_dir() or entry.name.startswith('.'):
+                    continue
+                for item in os.scandir(entry.path):
+                    if item.name.startswith('.'):
+                        continue
+                    try:
+                        stat = item.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, item.path))
+                    total += stat.st_size
+
+            removed = 0
+            # Evict down to 90% so that eviction does not run on every write
+            target = self.max_bytes * 9 // 10
+            if total > self.max_bytes:
+                for _, size, path in sorted(entries):
+                    if total <= target:
+                        break
+                    try:
+                        os.unlink(path)
+                    except FileNotFoundError:
+                        pass
+                    total -= size
+                    removed += 1
+
+            return removed
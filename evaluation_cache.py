@@ -0,0 +1,89 @@
+import os
+import json
+import shutil
+import fnmatch
+import hashlib
+
+from disk_cache import DiskCache
+from workspace import TemplateManifest
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'evaluation_results')
+
+# Outputs of a Cypress run that are not part of the suite
+EVAL_IGNORE = shutil.ignore_patterns('node_modules', 'videos', 'screenshots', 'downloads', '.git')
+
+# Template files that decide an evaluation's outcome. Anything else in the
+# template directory, such as the orchestrator's results and traces, must not
+# change the cache key from one run to the next.
+HARNESS_TOP_LEVEL = ('index.html', 'package.json', 'package-lock.json', '*.config.*', 'tsconfig*.json', '.env*')
+HARNESS_DIRECTORIES = ('src', 'public')
+
+# Only results that say something about the submission are worth caching
+CACHEABLE_STATUSES = {'passed', 'failed'}
+
+def solution_digest(blocks: list[tuple[str, str]]) -> str:
+    """Hashes extracted (file_path, file_content) tuples, independently of their order."""
+    files = {}
+    for file_name, code in blocks:
+        files[file_name] = hashlib.sha256(code.encode('utf-8', 'surrogatepass')).hexdigest()
+
+    digest = hashlib.sha256()
+    for file_name in sorted(files):
+        digest.update(f"{file_name}\0{files[file_name]}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+def decides_outcome(path: str) -> bool:
+    """Whether a template file can change the result of an evaluation."""
+    parts = path.replace(os.sep, '/').split('/')
+    if len(parts) > 1:
+        return parts[0] in HARNESS_DIRECTORIES
+    return any(fnmatch.fnmatch(parts[0], pattern) for pattern in HARNESS_TOP_LEVEL)
+
+def template_digest(template: TemplateManifest) -> str:
+    """Hashes the template files that decide an evaluation's outcome."""
+    digest = hashlib.sha256()
+    for path in sorted(template.files):
+        if decides_outcome(path):
+            digest.update(f"{path}\0{template.files[path][1]}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+def harness_digest(template: TemplateManifest, eval_dir: str) -> str:
+    """Hashes everything besides the submission that decides an evaluation's outcome.
+
+    Only the template's app files, configs and package-lock.json are
+    included; the eval suite tree covers its own lockfile.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"template\0{template_digest(template)}\n".encode('utf-8'))
+    digest.update(f"eval\0{TemplateManifest.build(eval_dir, EVAL_IGNORE).digest()}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+class EvaluationCache:
+    """Stored evaluation results keyed by submission and harness content."""
+
+    def __init__(self, harness: str, directory: str = None, max_bytes: int = 64 * 1024 * 1024):
+        self.harness = harness
+        self.store = DiskCache(directory or os.environ.get('EVALUATION_CACHE_DIR', DEFAULT_CACHE_DIR), max_bytes)
+
+    def key(self, blocks: list[tuple[str, str]]) -> str:
+        return hashlib.sha256(f"{self.harness}\0{solution_digest(blocks)}".encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        data = self.store.get(key)
+        if data is None:
+            return None
+        try:
+            return json.loads(data)
+        except ValueError:
+            return None
+
+    def set(self, key: str, result: dict) -> bool:
+        """Stores result if its status is worth caching; returns whether it was stored."""
+        if result.get('status') not in CACHEABLE_STATUSES:
+            return False
+        self.store.set(key, json.dumps(result).encode('utf-8'))
+        return True
+
+    def lock(self, key: str, blocking: bool = True):
+        """Serializes workers evaluating the same submission, see DiskCache.acquire."""
+        return self.store.acquire(key, blocking)
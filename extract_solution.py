@@ -1,4 +1,171 @@
+import os
 import re
+import mmap
+from functools import lru_cache
+
+# Bump when a change alters extraction results, so cached results are invalidated
+PARSER_VERSION = 1
+
+class CodeBlockSpan:
+    """A fenced code block located by offsets into the original text.
+
+    Nothing is copied until `filename` or `code` is read, so large responses
+    can be scanned without materializing every block.
+    """
+
+    __slots__ = ('text', 'language', 'filename_start', 'filename_end', 'code_start', 'code_end')
+
+    def __init__(self, text, language, filename_start, filename_end, code_start, code_end):
+        self.text = text
+        self.language = language
+        # None when the block has no filename comment
+        self.filename_start = filename_start
+        self.filename_end = filename_end
+        self.code_start = code_start
+        self.code_end = code_end
+
+    @property
+    def filename(self) -> str:
+        if self.filename_start is None:
+            return 'solution.tsx'
+        return self.text[self.filename_start:self.filename_end]
+
+    @property
+    def code(self) -> str:
+        return self.text[self.code_start:self.code_end]
+
+    def to_tuple(self, include_markers: bool = False) -> tuple[str, str]:
+        """Returns the (file_path, file_content) tuple of this block."""
+        code = self.code
+        if include_markers:
+            code = f"```{self.language}\n{code}\n```"
+        return self.filename, code
+
+    def __repr__(self):
+        return (f"CodeBlockSpan(language={self.language!r}, filename={self.filename!r}, "
+                f"code=[{self.code_start}:{self.code_end}])")
+
+def _make_span(text: str, lang: str, start: int, end: int) -> CodeBlockSpan:
+    """Builds the span of the block text[start:end] without copying it."""
+    # Same bounds as block.strip()
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+
+    if text.startswith('//', start, end):
+        strip_chars = '/ '
+    elif text.startswith('/*', start, end):
+        strip_chars = '/* '
+    else:
+        return CodeBlockSpan(text, lang, None, None, start, end)
+
+    # The first line holds the filename, the code follows it
+    newline = text.find('\n', start, end)
+    line_end = end if newline == -1 else newline
+    code_start = end if newline == -1 else newline + 1
+
+    filename_start, filename_end = start, line_end
+    while filename_start < filename_end and text[filename_start] in strip_chars:
+        filename_start += 1
+    while filename_end > filename_start and text[filename_end - 1] in strip_chars:
+        filename_end -= 1
+
+    return CodeBlockSpan(text, lang, filename_start, filename_end, code_start, end)
+
+# Any language, or none. The opening fence must start a line so that stray
+# backticks at the end of a sentence do not open a block. Fences with more
+# after the language (```tsx title="App", ``` tsx) still pair up with their
+# closing fence, but are skipped like the per-language patterns skip them.
+_ANY_CODE_BLOCK_PATTERN = re.compile(
+    r'(?<![^\n])```(?P<lang>[\w.+#-]*)(?:\s*\n|(?P<info>[^`\n]+)\n)(?P<code>.*?)```', re.DOTALL
+)
+
+@lru_cache(maxsize=32)
+def _code_block_pattern(languages: tuple[str, ...] = None) -> re.Pattern:
+    if languages is None:
+        return _ANY_CODE_BLOCK_PATTERN
+    language_pattern = '|'.join(map(re.escape, languages))
+    return re.compile(rf'```(?P<lang>{language_pattern})\s*\n(?P<code>.*?)```', re.DOTALL)
+
+def extract_code_spans(
+    markdown_text: str,
+    languages: list[str] = None
+) -> list[CodeBlockSpan]:
+    """Extracts code blocks from strings as offset spans.
+
+    With languages=None every fenced block is returned, whatever its language.
+    """
+    code_block_pattern = _code_block_pattern(None if languages is None else tuple(languages))
+    return [
+        _make_span(markdown_text, match.group('lang'), match.start('code'), match.end('code'))
+        for match in code_block_pattern.finditer(markdown_text)
+        if match.groupdict().get('info') is None
+    ]
+
+@lru_cache(maxsize=32)
+def _bytes_fence_pattern(languages: tuple[str, ...] = None) -> re.Pattern:
+    if languages is None:
+        return re.compile(rb'(?<![^\n])```(?P<lang>[\w.+#-]*)(?:\s*\n|(?P<info>[^`\n]+)\n)')
+    language_pattern = b'|'.join(re.escape(language.encode('utf-8')) for language in languages)
+    return re.compile(rb'```(?P<lang>' + language_pattern + rb')\s*\n')
+
+def _tuple_from_bytes(lang: str, block: bytes, include_markers: bool = False) -> tuple[str, str]:
+    """Bytes counterpart of CodeBlockSpan.to_tuple; only filename and code are decoded."""
+    # Same line endings as a response read in text mode
+    block = block.replace(b'\r\n', b'\n').replace(b'\r', b'\n').strip()
+    newline = block.find(b'\n')
+    first_line = block if newline == -1 else block[:newline]
+    rest = b'' if newline == -1 else block[newline + 1:]
+
+    if first_line.startswith(b'//'):
+        filename, code = first_line.strip(b'/ ').decode('utf-8'), rest.decode('utf-8')
+    elif first_line.startswith(b'/*'):
+        filename, code = first_line.strip(b'/* ').decode('utf-8'), rest.decode('utf-8')
+    else:
+        filename, code = 'solution.tsx', block.decode('utf-8')
+
+    if include_markers:
+        code = f"```{lang}\n{code}\n```"
+
+    return filename, code
+
+def extract_code_blocks_from_file(
+    file_path: str,
+    languages: list[str] = None,
+    include_markers: bool = False
+) -> list[tuple[str, str]]:
+    """Extracts code blocks from a file without reading it into a string.
+
+    The file is memory-mapped and fences are found on raw bytes, so only the
+    matching blocks are decoded. Results are the same as extract_code_blocks
+    on the text read in text mode, except that only ASCII whitespace is
+    stripped. With languages=None every fenced block is returned.
+    """
+    fence_pattern = _bytes_fence_pattern(None if languages is None else tuple(languages))
+    extracted_blocks = []
+
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return extracted_blocks
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            position = 0
+            while True:
+                match = fence_pattern.search(data, position)
+                if not match:
+                    break
+                end = data.find(b'```', match.end())
+                if end == -1:
+                    # Unclosed block, and no fence can follow it
+                    break
+                position = end + 3
+                if match.groupdict().get('info') is not None:
+                    continue
+                lang = match.group('lang').decode('utf-8')
+                extracted_blocks.append(_tuple_from_bytes(lang, data[match.end():end], include_markers))
+
+    return extracted_blocks
 
 def extract_code_blocks(
     markdown_text: str,
@@ -6,29 +173,155 @@ def extract_code_blocks(
     include_markers: bool = False
 ) -> list[tuple[str, str]]:
     """Extracts code blocks from strings."""
-    language_pattern = '|'.join(map(re.escape, languages))
-    code_block_pattern = re.compile(rf'```({language_pattern})\s*\n(.*?)```', re.DOTALL)
+    return [
+        span.to_tuple(include_markers)
+        for span in extract_code_spans(markdown_text, languages)
+    ]
 
-    matches = code_block_pattern.findall(markdown_text)
+class ExtractionResult:
+    """Every code block of a response, indexed by language and by filename.
 
-    extracted_blocks = []
-    for lang, block in matches:
-        lines = block.strip().split('\n')
-        if lines and lines[0].startswith('//'):
-            filename = lines[0].strip('/ ')
-            code = '\n'.join(lines[1:])
-        elif lines and lines[0].startswith('/*'):
-            filename = lines[0].strip('/* ')
-            code = '\n'.join(lines[1:])
+    Blocks without a filename comment are only indexed by language. When
+    several blocks name the same file the last one wins in `by_filename`,
+    and all of them are listed in `conflicts`.
+    """
+
+    def __init__(self, spans: list[CodeBlockSpan]):
+        self.spans = spans
+        self.by_language = {}
+        self.by_filename = {}
+        self.conflicts = {}
+
+        for span in spans:
+            self.by_language.setdefault(span.language, []).append(span)
+            if span.filename_start is None:
+                continue
+            filename = span.filename
+            if filename in self.by_filename:
+                self.conflicts.setdefault(filename, [self.by_filename[filename]]).append(span)
+            self.by_filename[filename] = span
+
+    def blocks(
+        self,
+        languages: list[str] = None,
+        include_markers: bool = False
+    ) -> list[tuple[str, str]]:
+        """Returns the (file_path, file_content) tuples of the given languages, in order."""
+        if languages is None:
+            spans = self.spans
         else:
-            filename = 'solution.tsx'
-            code = block.strip()
+            languages = set(languages)
+            spans = [span for span in self.spans if span.language in languages]
+        return [span.to_tuple(include_markers) for span in spans]
 
-        if include_markers:
-            code = f"```{lang}\n{code}\n```"
+    def files(self, languages: list[str] = None) -> dict[str, str]:
+        """Returns filename -> code of the named blocks, the last block winning."""
+        return {
+            filename: span.code
+            for filename, span in self.by_filename.items()
+            if languages is None or span.language in languages
+        }
 
-        extracted_blocks.append((filename, code))
-    return extracted_blocks
+def extract_all_code_blocks(markdown_text: str, strict: bool = False) -> ExtractionResult:
+    """Extracts every fenced block of a response in a single pass.
+
+    Args:
+        markdown_text: The text to scan.
+        strict: Raise ValueError when several blocks name the same file.
+    """
+    result = ExtractionResult(extract_code_spans(markdown_text, languages=None))
+    if strict and result.conflicts:
+        raise ValueError(f"Duplicate files in response: {', '.join(sorted(result.conflicts))}")
+    return result
+
+class SolutionExtractor:
+    """Incrementally extracts code blocks from a streamed LLM response.
+
+    Feed chunks as they arrive; each call returns the (file_path, file_content)
+    tuples whose closing fence has been seen, in the same form as
+    `extract_solution`. Text is scanned once: outside a block only a short
+    carry-over (a fence line that is still incomplete) is kept between chunks.
+    """
+
+    def __init__(
+        self,
+        languages: list[str] = None,
+        include_markers: bool = False
+    ):
+        languages = languages or ["typescript", "tsx"]
+        self._languages = languages
+        language_pattern = '|'.join(map(re.escape, languages))
+        self._open_pattern = re.compile(rf'```({language_pattern})\s*\n')
+        self._include_markers = include_markers
+        self._carry = ''
+        # State of the block currently being read, if any
+        self._lang = None
+        self._parts = []
+        self._tail = ''
+
+    def feed(self, chunk: str) -> list[tuple[str, str]]:
+        """Consumes a chunk and returns the blocks completed by it."""
+        completed = []
+        text = chunk
+        while text:
+            if self._lang is None:
+                buffer = self._carry + text
+                match = self._open_pattern.search(buffer)
+                if not match:
+                    self._carry = self._carry_over(buffer)
+                    break
+                self._carry = ''
+                self._lang = match.group(1)
+                text = buffer[match.end():]
+                continue
+
+            # Inside a block: the closing fence may straddle the previous chunk
+            window = self._tail + text
+            index = window.find('```')
+            if index == -1:
+                self._parts.append(text)
+                self._tail = window[-2:]
+                break
+
+            block = ''.join(self._parts) + text
+            block = block[:len(block) - len(window) + index]
+            span = _make_span(block, self._lang, 0, len(block))
+            completed.append(span.to_tuple(self._include_markers))
+            text = window[index + 3:]
+            self._lang = None
+            self._parts = []
+            self._tail = ''
+        return completed
+
+    def close(self) -> list[tuple[str, str]]:
+        """Ends the stream; an unclosed block is dropped like in `extract_code_blocks`."""
+        self._carry = ''
+        self._lang = None
+        self._parts = []
+        self._tail = ''
+        return []
+
+    def _carry_over(self, buffer: str) -> str:
+        """Returns the suffix of `buffer` that may still start an opening fence.
+
+        The suffix is at most a fence, the longest language name and one
+        character, so text without a match is never scanned twice.
+        """
+        index = buffer.rfind('```')
+        if index != -1 and '\n' not in buffer[index:]:
+            rest = buffer[index + 3:]
+            for language in self._languages:
+                if language.startswith(rest):
+                    return buffer[index:]
+                if rest.startswith(language) and not rest[len(language):].strip():
+                    # Any run of whitespace before the newline matches `\s*`, one space stands for it
+                    return '```' + language + (' ' if len(rest) > len(language) else '')
+        # A fence may also be split right after its first backticks
+        if buffer.endswith('``'):
+            return '``'
+        if buffer.endswith('`'):
+            return '`'
+        return ''
 
 def extract_solution(llm_response: str) -> list[tuple[str, str]]:
     """Extracts a list of file paths and code contents from an LLM's response.
@@ -45,3 +338,7 @@ def extract_solution(llm_response: str) -> list[tuple[str, str]]:
 
     # print(files)
     return code_blocks
+
+def extract_solution_from_file(file_path: str) -> list[tuple[str, str]]:
+    """Same as extract_solution, for a response stored in a file, possibly a huge one."""
+    return extract_code_blocks_from_file(file_path, languages=["typescript", "tsx"])
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import sys
+import random
+import tempfile
+
+from extract_solution import (
+    SolutionExtractor, extract_all_code_blocks, extract_code_blocks, extract_code_blocks_from_file,
+)
+from extract_solution_test import llm_response
+
+LANGUAGES = ["typescript", "tsx"]
+
+def reference_extract_code_blocks(markdown_text, languages, include_markers=False):
+    """The original strip()/split() implementation every parser path must agree with."""
+    language_pattern = '|'.join(map(re.escape, languages))
+    code_block_pattern = re.compile(rf'```({language_pattern})\s*\n(.*?)```', re.DOTALL)
+
+    extracted_blocks = []
+    for lang, block in code_block_pattern.findall(markdown_text):
+        lines = block.strip().split('\n')
+        if lines and lines[0].startswith('//'):
+            filename = lines[0].strip('/ ')
+            code = '\n'.join(lines[1:])
+        elif lines and lines[0].startswith('/*'):
+            filename = lines[0].strip('/* ')
+            code = '\n'.join(lines[1:])
+        else:
+            filename = 'solution.tsx'
+            code = block.strip()
+
+        if include_markers:
+            code = f"```{lang}\n{code}\n```"
+
+        extracted_blocks.append((filename, code))
+    return extracted_blocks
+
+cases = {
+    'fixture': llm_response,
+    'crlf': llm_response.replace('\n', '\r\n'),
+    'crlf_small': "Intro\r\n```tsx\r\n// src/App.tsx\r\nexport default 1;\r\n```\r\n",
+    'block_comment_filename': "```tsx\n/* src/a.tsx */\nconst a = 1;\n```",
+    'jsdoc_first_line': "```typescript\n/**\n * Docs\n */\nexport const b = 2;\n```",
+    'no_filename': "```tsx\nconst c = 3;\n```",
+    'only_filename': "```tsx\n// src/empty.tsx\n```",
+    'empty_block': "```tsx\n```",
+    'unclosed': "```tsx\n// src/a.tsx\nconst a = 1;\n```\n```tsx\n// src/b.tsx\nconst b =",
+    'fence_trailing_spaces': "```tsx   \t\n// src/a.tsx\nx\n```",
+    'other_languages': "```css\n/* a.css */\nbody {}\n```\n```tsx\n// src/a.tsx\n1\n```",
+    'inline_fences': "Use ```tsx blocks``` like ```tsx\n// src/a.tsx\n1\n```",
+    'four_backticks': "````tsx\n// src/a.tsx\n1\n````",
+    'blank_lines': "```tsx\n\n\n// src/a.tsx\n\n1\n\n\n```",
+}
+
+# Checked with languages=None: the single any-language pass must give the
+# blocks of the per-language passes over these languages, in order
+ANY_LANGUAGES = ["typescript", "tsx", "css", "json"]
+
+any_language_cases = {
+    'mixed': "```tsx\n// src/a.tsx\n1\n```\n```css\n/* src/a.css */\nbody {}\n```\n```json\n{}\n```",
+    'info_string': "Intro\n```tsx title=\"App\"\n// src/App.tsx\nx\n```\nProse.\n"
+                   "```css\n/* src/a.css */\nbody {}\n```\nMore prose.\n```tsx\n// src/b.tsx\ny\n```\n",
+    'space_before_language': "```  tsx\n// src/App.tsx\nx\n```\nProse.\n```tsx\n// src/b.tsx\ny\n```\n",
+    'crlf': "```tsx\r\n// src/a.tsx\r\n1\r\n```\r\n```css\r\n/* a.css */\r\nb {}\r\n```\r\n",
+    'unclosed': "```css\n/* a.css */\nb {}\n```\n```tsx\n// src/b.tsx\nconst b =",
+}
+
+def check_any_language_case(name, text):
+    """Returns the any-language paths that disagree with the per-language reference."""
+    failures = []
+    expected = reference_extract_code_blocks(text, ANY_LANGUAGES)
+    if extract_code_blocks(text, None) != expected:
+        failures.append(f"{name}: extract_code_blocks (languages=None)")
+    if from_file(text, include_markers=False, languages=None) != \
+            reference_extract_code_blocks(text.replace('\r\n', '\n'), ANY_LANGUAGES):
+        failures.append(f"{name}: extract_code_blocks_from_file (languages=None)")
+
+    result = extract_all_code_blocks(text)
+    for language in ANY_LANGUAGES:
+        if result.blocks([language]) != reference_extract_code_blocks(text, [language]):
+            failures.append(f"{name}: extract_all_code_blocks (blocks of {language})")
+    return failures
+
+def split_text(text, sizes):
+    chunks, position = [], 0
+    for size in sizes:
+        if position >= len(text):
+            break
+        chunks.append(text[position:position + size])
+        position += size
+    if position < len(text):
+        chunks.append(text[position:])
+    return chunks
+
+def streamed(chunks, include_markers):
+    extractor = SolutionExtractor(LANGUAGES, include_markers)
+    blocks = []
+    for chunk in chunks:
+        blocks.extend(extractor.feed(chunk))
+    blocks.extend(extractor.close())
+    return blocks
+
+def from_file(text, include_markers, languages=LANGUAGES):
+    with tempfile.NamedTemporaryFile('wb', suffix='.md', delete=False) as f:
+        f.write(text.encode('utf-8'))
+    try:
+        return extract_code_blocks_from_file(f.name, languages, include_markers)
+    finally:
+        os.unlink(f.name)
+
+def check_case(name, text, rng):
+    """Returns a description of every parser path that disagrees with the reference."""
+    failures = []
+    for include_markers in (False, True):
+        # The file path reads bytes, so compare it with a text-mode read of them
+        text_mode = text.replace('\r\n', '\n')
+        expected = reference_extract_code_blocks(text, LANGUAGES, include_markers)
+        if extract_code_blocks(text, LANGUAGES, include_markers) != expected:
+            failures.append(f"{name}: extract_code_blocks (include_markers={include_markers})")
+        if from_file(text, include_markers) != reference_extract_code_blocks(text_mode, LANGUAGES, include_markers):
+            failures.append(f"{name}: extract_code_blocks_from_file (include_markers={include_markers})")
+
+        splits = [[size] * len(text) for size in range(1, 8)]
+        splits += [[rng.randint(1, 64) for _ in range(len(text))] for _ in range(20)]
+        for sizes in splits:
+            if streamed(split_text(text, sizes), include_markers) != expected:
+                failures.append(f"{name}: SolutionExtractor (include_markers={include_markers}, chunks {sizes[:4]}...)")
+                break
+    return failures
+
+if __name__ == "__main__":
+    rng = random.Random(0)
+    failures = []
+    for name, text in cases.items():
+        failures.extend(check_case(name, text, rng))
+    for name, text in any_language_cases.items():
+        failures.extend(check_any_language_case(name, text))
+
+    for failure in failures:
+        print(f"Mismatch: {failure}")
+    if failures:
+        sys.exit(1)
+    print(f"All {len(cases) + len(any_language_cases)} cases match the reference extraction.")
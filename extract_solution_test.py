@@ -2,6 +2,8 @@
 
 import os
 from extract_solution import extract_solution
+from solution_writer import write_solution
+from tracing import Tracer
 
 llm_response = """
 ```tsx
@@ -1214,26 +1216,33 @@ export const deleteClass = async (classId: string): Promise<{ success: boolean }
 
 """
 
-try:
-    response = extract_solution(llm_response=llm_response)
+if __name__ == "__main__":
+    tracer = Tracer()
+    try:
+        with tracer.span("extract"):
+            response = extract_solution(llm_response=llm_response)
 
-    if not isinstance(response, list):
-        raise ValueError("Expected response to be a list of (file_name, code) tuples.")
+        if not isinstance(response, list):
+            raise ValueError("Expected response to be a list of (file_name, code) tuples.")
 
-    for item in response:
-        if not isinstance(item, tuple) or len(item) != 2:
-            raise ValueError("Invalid tuple.")
+        for item in response:
+            if not isinstance(item, tuple) or len(item) != 2:
+                raise ValueError("Invalid tuple.")
 
-        file_name, code = item
+        # Write or create the files, skipping those whose content is unchanged
+        with tracer.span("write_files", files=len(response)):
+            summary = write_solution(response, ".")
 
-        # Ensure the directory exists
-        os.makedirs(os.path.dirname(file_name) or ".", exist_ok=True)
+        for file_name in summary["written"]:
+            print(f"File '{file_name}' written successfully.")
+        for file_name in summary["unchanged"]:
+            print(f"File '{file_name}' unchanged.")
+        for file_name, error in summary["failed"]:
+            print(f"Failed to write '{file_name}': {error}")
 
-        # Write or create the file
-        with open(file_name, "w") as file:
-            file.write(code)
+    except Exception as e:
+        print(f"An error occurred while running extract solution test: {e}")
 
-        print(f"File '{file_name}' written successfully.")
-
-except Exception as e:
-    print(f"An error occurred while running extract solution test: {e}")
+    # Set TRACE_OUTPUT to save the stage timings as a Chrome trace
+    if os.environ.get("TRACE_OUTPUT"):
+        tracer.save(os.environ["TRACE_OUTPUT"])
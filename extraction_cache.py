@@ -0,0 +1,78 @@
+import os
+import struct
+import hashlib
+
+from disk_cache import DiskCache
+from extract_solution import PARSER_VERSION, extract_code_blocks
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'extract_solution')
+
+_COUNT = struct.Struct('<I')
+_ENTRY = struct.Struct('<II')
+
+def cache_key(llm_response: str, languages: list[str]) -> str:
+    """Hashes the response together with the language set and parser version."""
+    # Not used for security; sha1 is the fastest stdlib digest on most CPUs
+    digest = hashlib.sha1(usedforsecurity=False)
+    digest.update(f"{PARSER_VERSION}\0{','.join(languages)}\0".encode('utf-8'))
+    digest.update(llm_response.encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+def encode_blocks(blocks: list[tuple[str, str]]) -> bytes:
+    """Packs (file_path, file_content) tuples as length-prefixed UTF-8."""
+    parts = [_COUNT.pack(len(blocks))]
+    for file_name, code in blocks:
+        name_data = file_name.encode('utf-8', 'surrogatepass')
+        code_data = code.encode('utf-8', 'surrogatepass')
+        parts.append(_ENTRY.pack(len(name_data), len(code_data)))
+        parts.append(name_data)
+        parts.append(code_data)
+    return b''.join(parts)
+
+def decode_blocks(data: bytes) -> list[tuple[str, str]]:
+    (count,) = _COUNT.unpack_from(data)
+    offset = _COUNT.size
+    blocks = []
+    for _ in range(count):
+        name_size, code_size = _ENTRY.unpack_from(data, offset)
+        offset += _ENTRY.size
+        file_name = data[offset:offset + name_size].decode('utf-8', 'surrogatepass')
+        offset += name_size
+        code = data[offset:offset + code_size].decode('utf-8', 'surrogatepass')
+        offset += code_size
+        blocks.append((file_name, code))
+    return blocks
+
+class ExtractionCache:
+    """Persistent cache of extraction results keyed by response hash."""
+
+    def __init__(self, directory: str = None, max_bytes: int = 256 * 1024 * 1024):
+        self.store = DiskCache(directory or os.environ.get('EXTRACTION_CACHE_DIR', DEFAULT_CACHE_DIR), max_bytes)
+
+    def extract(self, llm_response: str, languages: list[str] = None) -> list[tuple[str, str]]:
+        """Returns extract_code_blocks(llm_response, languages), from the cache when possible."""
+        languages = languages or ["typescript", "tsx"]
+        key = cache_key(llm_response, languages)
+
+        data = self.store.get(key)
+        if data is not None:
+            try:
+                return decode_blocks(data)
+            except (struct.error, UnicodeDecodeError):
+                # Corrupted entry, extract again and overwrite it
+                pass
+
+        blocks = extract_code_blocks(llm_response, languages=languages)
+        self.store.set(key, encode_blocks(blocks))
+        return blocks
+
+_default_cache = None
+
+def cached_extract_solution(llm_response: str, cache: ExtractionCache = None) -> list[tuple[str, str]]:
+    """Same as extract_solution, but served from a persistent cache on repeated responses."""
+    global _default_cache
+    if cache is None:
+        if _default_cache is None:
+            _default_cache = ExtractionCache()
+        cache = _default_cache
+    return cache.extract(llm_response, ["typescript", "tsx"])
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from extraction_server import DEFAULT_SOCKET, ExtractionClient
+from extract_solution_test import llm_response
+from tracing import percentile
+
+def run_client(socket_path, requests, response):
+    """Sends requests extractions over one connection; returns their latencies."""
+    latencies = []
+    with ExtractionClient(socket_path) as client:
+        for _ in range(requests):
+            start = time.perf_counter()
+            client.extract(response)
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the extraction service.')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help=f'Socket path (default: {DEFAULT_SOCKET})')
+    parser.add_argument('--clients', type=int, default=8, help='Concurrent connections (default: 8)')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per connection (default: 200)')
+    parser.add_argument('--response', default=None, help='File with the response to send (default: the extract_solution_test.py fixture)')
+
+    args = parser.parse_args()
+
+    response = llm_response
+    if args.response:
+        with open(args.response, 'r', encoding='utf-8') as f:
+            response = f.read()
+
+    try:
+        ExtractionClient(args.socket).close()
+    except OSError as e:
+        print(f"Error: Cannot connect to '{args.socket}': {e}")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as executor:
+        results = executor.map(run_client, [args.socket] * args.clients,
+                               [args.requests] * args.clients, [response] * args.clients)
+        latencies = [latency for client_latencies in results for latency in client_latencies]
+    elapsed = time.perf_counter() - started
+
+    print(json.dumps({
+        'clients': args.clients,
+        'requests': len(latencies),
+        'seconds': elapsed,
+        'requests_per_second': len(latencies) / elapsed,
+        'latency_ms': {
+            f'p{p}': percentile(latencies, p) * 1000 for p in (50, 90, 99)
+        },
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
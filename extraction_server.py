@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import socket
+import struct
+import signal
+import asyncio
+import argparse
+
+from extract_solution import extract_code_blocks, extract_solution
+from solution_writer import write_solution
+
+DEFAULT_SOCKET = '/tmp/extract_solution.sock'
+
+# Every message is a 4-byte big-endian length followed by that many bytes of JSON
+LENGTH = struct.Struct('>I')
+MAX_MESSAGE_SIZE = 256 * 1024 * 1024
+
+WARMUP_RESPONSE = "```tsx\n// src/App.tsx\nexport default 1;\n```\n```typescript\n// src/a.ts\n```"
+
+def handle_request(request: dict) -> dict:
+    """Runs one request; raises on invalid input."""
+    op = request.get('op', 'extract')
+    if op == 'ping':
+        return {'ok': True}
+    if op != 'extract':
+        raise ValueError(f"Unknown op: {op!r}")
+
+    languages = request.get('languages')
+    if languages:
+        files = extract_code_blocks(request['response'], languages=languages)
+    else:
+        files = extract_solution(request['response'])
+
+    reply = {'ok': True, 'files': files}
+    if request.get('materialize'):
+        reply['written'] = write_solution(files, request['materialize'])
+    return reply
+
+async def _read_message(reader) -> dict | None:
+    try:
+        header = await reader.readexactly(LENGTH.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (size,) = LENGTH.unpack(header)
+    if size > MAX_MESSAGE_SIZE:
+        raise ValueError(f"Message of {size} bytes exceeds the {MAX_MESSAGE_SIZE} byte limit")
+    return json.loads(await reader.readexactly(size))
+
+def _encode_message(message: dict) -> bytes:
+    data = json.dumps(message).encode('utf-8')
+    return LENGTH.pack(len(data)) + data
+
+async def handle_client(reader, writer):
+    """Serves requests from one connection until the client closes it."""
+    try:
+        while True:
+            try:
+                request = await _read_message(reader)
+            except (ValueError, asyncio.IncompleteReadError) as e:
+                # The stream is out of sync, reply and drop the connection
+                writer.write(_encode_message({'ok': False, 'error': f"Bad message: {e}"}))
+                await writer.drain()
+                return
+            if request is None:
+                return
+
+            try:
+                if request.get('materialize'):
+                    reply = await asyncio.to_thread(handle_request, request)
+                else:
+                    reply = handle_request(request)
+            except Exception as e:
+                reply = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+
+            writer.write(_encode_message(reply))
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+def warm_up() -> None:
+    """Compiles and caches the fence patterns before the first client arrives."""
+    extract_solution(WARMUP_RESPONSE)
+
+async def serve(socket_path: str = DEFAULT_SOCKET) -> None:
+    warm_up()
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    server = await asyncio.start_unix_server(handle_client, path=socket_path, limit=1 << 20)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    print(f"Serving extraction on: {socket_path}")
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+class ExtractionClient:
+    """Blocking client for the extraction service, keeping one connection open."""
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, timeout: float = 60.0):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(socket_path)
+
+    def _receive_exactly(self, size: int) -> bytes:
+        chunks = []
+        while size:
+            chunk = self.sock.recv(min(size, 1 << 20))
+            if not chunk:
+                raise ConnectionError("Extraction service closed the connection")
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b''.join(chunks)
+
+    def request(self, message: dict) -> dict:
+        self.sock.sendall(_encode_message(message))
+        (size,) = LENGTH.unpack(self._receive_exactly(LENGTH.size))
+        reply = json.loads(self._receive_exactly(size))
+        if not reply.get('ok'):
+            raise RuntimeError(reply.get('error', 'Extraction failed'))
+        return reply
+
+    def extract(self, llm_response: str, languages: list[str] = None) -> list[tuple[str, str]]:
+        """Same as extract_solution (or extract_code_blocks with languages), served remotely."""
+        reply = self.request({'op': 'extract', 'response': llm_response, 'languages': languages})
+        return [tuple(item) for item in reply['files']]
+
+    def materialize(self, llm_response: str, root: str) -> dict:
+        """Extracts and writes the files under root on the server side; returns write_solution's summary."""
+        reply = self.request({'op': 'extract', 'response': llm_response, 'materialize': root})
+        return reply['written']
+
+    def ping(self) -> None:
+        self.request({'op': 'ping'})
+
+    def close(self) -> None:
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve extract_solution over a Unix domain socket.')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help=f'Socket path (default: {DEFAULT_SOCKET})')
+
+    args = parser.parse_args()
+    asyncio.run(serve(args.socket))
+
+if __name__ == "__main__":
+    main()
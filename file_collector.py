@@ -3,8 +3,16 @@
 import os
 import argparse
 import re
+import json
+import hashlib
+import fnmatch
+import subprocess
+from collections import deque
 from pathlib import Path
 
+from import_graph import DiskFiles, scan_imports
+from workspace import hash_file
+
 def detect_language(file_path):
     """Detect language based on file extension."""
     ext = os.path.splitext(file_path)[1].lower()
@@ -61,24 +69,223 @@ def should_include_file(file_path):
     
     return True
 
-def process_file(file_path, output_file, base_dir=None):
-    """Process a single file and write it to the output."""
+# Comment syntax per language: (line comment prefix, (block start, block end))
+COMMENT_SYNTAX = {
+    'python': ('#', None),
+    'bash': ('#', None),
+    'yaml': ('#', None),
+    'ruby': ('#', None),
+    'javascript': ('//', ('/*', '*/')),
+    'jsx': ('//', ('/*', '*/')),
+    'typescript': ('//', ('/*', '*/')),
+    'tsx': ('//', ('/*', '*/')),
+    'java': ('//', ('/*', '*/')),
+    'c': ('//', ('/*', '*/')),
+    'cpp': ('//', ('/*', '*/')),
+    'go': ('//', ('/*', '*/')),
+    'rust': ('//', ('/*', '*/')),
+    'php': ('//', ('/*', '*/')),
+    'swift': ('//', ('/*', '*/')),
+    'kotlin': ('//', ('/*', '*/')),
+    'css': (None, ('/*', '*/')),
+    'sql': ('--', ('/*', '*/')),
+    'html': (None, ('<!--', '-->')),
+}
+
+# Languages where indentation carries meaning and must be kept as is
+INDENT_SENSITIVE = {'python', 'yaml', 'markdown'}
+
+def estimate_tokens(num_bytes):
+    """Rough token count of source text, about four bytes per token."""
+    return num_bytes // 4
+
+def compact_lines(lines, language, strip_comments=False):
+    """Yield compacted lines, one input line at a time.
+
+    Trailing whitespace is removed, runs of blank lines collapse to one,
+    and leading spaces are halved unless the language is indentation
+    sensitive. With strip_comments, whole-line comments and block comments
+    starting a line are dropped as well.
+    """
+    line_comment, block = COMMENT_SYNTAX.get(language, (None, None)) if strip_comments else (None, None)
+    halve = bool(language) and language not in INDENT_SENSITIVE
+    in_block = False
+    pending_blank = False
+    started = False
+
+    for line in lines:
+        line = line.rstrip()
+        stripped = line.lstrip()
+        indent = line[:len(line) - len(stripped)]
+
+        if in_block:
+            end = line.find(block[1])
+            if end == -1:
+                continue
+            in_block = False
+            line = line[end + len(block[1]):].rstrip()
+            stripped = line.lstrip()
+            indent = ''
+            if not line:
+                continue
+        elif block and stripped.startswith(block[0]):
+            end = stripped.find(block[1], len(block[0]))
+            if end == -1:
+                in_block = True
+                continue
+            rest = stripped[end + len(block[1]):].lstrip()
+            if not rest:
+                continue
+            line, stripped = indent + rest, rest
+        elif line_comment and stripped.startswith(line_comment) and not stripped.startswith('#!'):
+            continue
+
+        if not line:
+            # Emitted only before the next non-blank line, so leading and trailing runs vanish
+            pending_blank = started
+            continue
+        if pending_blank:
+            yield ''
+            pending_blank = False
+        started = True
+
+        if halve and indent:
+            spaces = len(indent) - len(indent.lstrip(' '))
+            line = ' ' * ((spaces + 1) // 2) + line[spaces:]
+        yield line
+
+# Files above this size are handled by the large file rules
+DEFAULT_MAX_FILE_SIZE = 100_000
+DEFAULT_SAMPLE_BYTES = 4096
+
+# (glob, action) pairs tried in order for large files; others are sampled.
+# Actions: 'skip' leaves the file out, 'sample' keeps its head and tail,
+# 'summary' emits a structural summary.
+DEFAULT_LARGE_FILE_RULES = [
+    ('package-lock.json', 'summary'),
+    ('yarn.lock', 'skip'),
+    ('pnpm-lock.yaml', 'skip'),
+    ('*.min.js', 'skip'),
+    ('*.min.css', 'skip'),
+    ('*.map', 'skip'),
+]
+LARGE_FILE_ACTIONS = ('skip', 'sample', 'summary')
+
+# How far into a lockfile to look for its root package entry
+SUMMARY_READ_LIMIT = 1 << 20
+
+class LargeFilePolicy:
+    """Decides how files above a size threshold are emitted."""
+
+    def __init__(self, max_size=DEFAULT_MAX_FILE_SIZE, rules=None, sample_bytes=DEFAULT_SAMPLE_BYTES):
+        self.max_size = max_size
+        self.rules = DEFAULT_LARGE_FILE_RULES if rules is None else rules
+        self.sample_bytes = sample_bytes
+
+    def action(self, rel_path, size):
+        """Return the action for a file, or None to emit it whole."""
+        if not self.max_size or size <= self.max_size:
+            return None
+        name = os.path.basename(rel_path)
+        for pattern, action in self.rules:
+            if fnmatch.fnmatch(rel_path, pattern) or fnmatch.fnmatch(name, pattern):
+                return action
+        return 'sample'
+
+def parse_large_file_rule(rule):
+    """Parse a 'glob=action' command line rule."""
+    pattern, _, action = rule.rpartition('=')
+    if not pattern or action not in LARGE_FILE_ACTIONS:
+        raise argparse.ArgumentTypeError(f"expected GLOB=ACTION with ACTION one of {', '.join(LARGE_FILE_ACTIONS)}")
+    return pattern, action
+
+def comment_line(language, text):
+    """Format text as a single comment line in the file's language."""
+    line_comment, block = COMMENT_SYNTAX.get(language, ('//', None))
+    if line_comment:
+        return f"{line_comment} {text}"
+    if block:
+        return f"{block[0]} {text} {block[1]}"
+    return f"// {text}"
+
+def sample_file(file_path, size, sample_bytes):
+    """Read whole lines from the head and tail of a file, seeking past the middle."""
+    with open(file_path, 'rb') as f:
+        head = f.read(sample_bytes)
+        head = head[:head.rfind(b'\n') + 1]
+        f.seek(max(size - sample_bytes, len(head)))
+        tail = f.read()
+    newline = tail.find(b'\n')
+    tail = tail[newline + 1:] if newline != -1 else b''
+    return head.decode('utf-8'), tail.decode('utf-8')
+
+def summarize_lockfile(file_path):
+    """Summarize an npm lockfile by its root package entry, read from the file's head.
+
+    Returns None if the entry is not found near the start of the file.
+    """
+    decoder = json.JSONDecoder()
+    pattern = re.compile(r'"packages"\s*:\s*\{\s*""\s*:\s*')
+    data = ''
+    with open(file_path, 'r', encoding='utf-8') as f:
+        while len(data) < SUMMARY_READ_LIMIT:
+            chunk = f.read(1 << 16)
+            if not chunk:
+                break
+            data += chunk
+            match = pattern.search(data)
+            if not match:
+                continue
+            try:
+                root, _ = decoder.raw_decode(data, match.end())
+            except ValueError:
+                # The entry continues in the next chunk
+                continue
+            header = re.search(r'"lockfileVersion"\s*:\s*(\d+)', data[:match.start()])
+            return {
+                'name': root.get('name'),
+                'version': root.get('version'),
+                'lockfileVersion': int(header.group(1)) if header else None,
+                'dependencies': sorted(root.get('dependencies', {})),
+                'devDependencies': sorted(root.get('devDependencies', {})),
+            }
+    return None
+
+def process_file(file_path, output_file, base_dir=None, compact=False, strip_comments=False, policy=None):
+    """Process a single file and write it to the output.
+
+    Returns the number of bytes saved by compact mode.
+    """
     file_path = os.path.abspath(file_path)
     
     # Skip files that should not be included
     if not should_include_file(file_path):
         print(f"Skipping excluded file: {file_path}")
-        return
+        return 0
     
     # Determine the relative path for display
-    if base_dir:
-        rel_path = os.path.relpath(file_path, base_dir)
-    else:
-        rel_path = os.path.basename(file_path)
+    rel_path = relative_path(file_path, base_dir)
     
     language = detect_language(file_path)
     
+    action = None
+    if policy:
+        try:
+            action = policy.action(rel_path, os.path.getsize(file_path))
+        except OSError as e:
+            print(f"Error processing {rel_path}: {e}")
+            return 0
+    if action == 'skip':
+        print(f"Skipping large file: {rel_path}")
+        return 0
+
     with open(output_file, 'a', encoding='utf-8') as output:
+        if action:
+            _write_large(file_path, rel_path, language, output, action, policy)
+            return 0
+        if compact:
+            return _write_compact(file_path, rel_path, language, output, strip_comments)
+
         try:
             # Try to read the file
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -99,9 +306,76 @@ def process_file(file_path, output_file, base_dir=None):
             print(f"Skipping binary file: {rel_path}")
         except Exception as e:
             print(f"Error processing {rel_path}: {e}")
+    return 0
+
+def _write_compact(file_path, rel_path, language, output, strip_comments):
+    """Stream a compacted block into output; returns the bytes saved."""
+    output.flush()
+    block_start = output.tell()
+    try:
+        original = os.path.getsize(file_path)
+        written = 0
+        with open(file_path, 'r', encoding='utf-8') as f:
+            output.write(f"```{language}\n")
+            output.write(f"// {rel_path}\n")
+            for line in compact_lines(f, language, strip_comments):
+                output.write(line + '\n')
+                written += len(line.encode('utf-8')) + 1
+        output.write("```\n\n")
+    except Exception as e:
+        # Drop the partially written block so no fence is left unclosed
+        output.flush()
+        output.truncate(block_start)
+        if isinstance(e, UnicodeDecodeError):
+            print(f"Skipping binary file: {rel_path}")
+        else:
+            print(f"Error processing {rel_path}: {e}")
+        return 0
+
+    saved = max(original - written, 0)
+    print(f"Compacted {rel_path}: saved {saved} bytes (~{estimate_tokens(saved)} tokens)")
+    return saved
 
-def process_directory(source_dir, output_file):
-    """Process all files in a directory and its subdirectories."""
+def _write_large(file_path, rel_path, language, output, action, policy):
+    """Write a summary or head/tail sample of a large file, marked as truncated."""
+    size = os.path.getsize(file_path)
+    try:
+        summary = summarize_lockfile(file_path) if action == 'summary' else None
+        if summary is not None:
+            body = json.dumps(summary, indent=2) + '\n'
+            note = f"truncated: summary of {size} bytes, top-level dependencies only"
+        else:
+            head, tail = sample_file(file_path, size, policy.sample_bytes)
+            omitted = size - len(head.encode('utf-8')) - len(tail.encode('utf-8'))
+            body = head + comment_line(language, f"... {omitted} bytes omitted ...") + '\n' + tail
+            if body and not body.endswith('\n'):
+                body += '\n'
+            note = f"truncated: first and last lines of {size} bytes"
+    except UnicodeDecodeError:
+        print(f"Skipping binary file: {rel_path}")
+        return
+    except Exception as e:
+        print(f"Error processing {rel_path}: {e}")
+        return
+
+    output.write(f"```{language}\n")
+    output.write(f"// {rel_path}\n")
+    output.write(comment_line(language, note) + '\n')
+    output.write(body)
+    output.write("```\n\n")
+    print(f"Truncated large file: {rel_path} ({size} bytes)")
+
+def list_directory(source_dir):
+    """Yield the path of every file in a directory and its subdirectories."""
+    for root, _, files in os.walk(source_dir):
+        for file in files:
+            yield os.path.join(root, file)
+
+def process_directory(source_dir, output_file, compact=False, strip_comments=False, policy=None):
+    """Process all files in a directory and its subdirectories.
+
+    Returns the number of bytes saved by compact mode.
+    """
     source_dir = os.path.abspath(source_dir)
     base_dir = os.path.dirname(source_dir)
     
@@ -109,15 +383,250 @@ def process_directory(source_dir, output_file):
     with open(output_file, 'w', encoding='utf-8') as output:
         pass
     
-    for root, _, files in os.walk(source_dir):
-        for file in files:
-            file_path = os.path.join(root, file)
-            process_file(file_path, output_file, base_dir)
+    saved = 0
+    for file_path in list_directory(source_dir):
+        saved += process_file(file_path, output_file, base_dir, compact, strip_comments, policy)
+    return saved
+
+class ImportCache:
+    """Import lists of parsed files, keyed by content hash and saved as JSON."""
+
+    def __init__(self, cache_file=None):
+        self.cache_file = cache_file
+        self.entries = {}
+        self.used = {}
+        self.loaded = set()
+        if cache_file and os.path.exists(cache_file):
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+                self.loaded = set(self.entries)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def specifiers(self, file_path, data):
+        """Return the import specifiers of a file, parsing it only on a cache miss."""
+        ext = os.path.splitext(file_path)[1].lower()
+        key = hashlib.sha1(data, usedforsecurity=False).hexdigest() + ext
+        if key not in self.entries:
+            code = data.decode('utf-8', errors='replace')
+            self.entries[key] = [specifier for _, specifier in scan_imports(file_path, code)]
+        self.used[key] = self.entries[key]
+        return self.used[key]
+
+    def save(self):
+        # Only entries of this run are kept, so the cache does not grow without bound
+        if not self.cache_file or set(self.used) == self.loaded:
+            return
+        tmp_file = f"{self.cache_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.used, f)
+        os.replace(tmp_file, self.cache_file)
+
+def collect_reachable(entries, base_dir, cache=None):
+    """Find the files reachable from the entry files through relative imports.
+
+    Returns absolute paths in the order they were discovered.
+    """
+    base_dir = os.path.abspath(base_dir)
+    resolver = DiskFiles(base_dir)
+    cache = cache or ImportCache()
+
+    queue = deque()
+    seen = set()
+    for entry in entries:
+        path = os.path.relpath(os.path.abspath(entry), base_dir).replace(os.sep, '/')
+        if path not in seen:
+            seen.add(path)
+            queue.append(path)
+
+    reachable = []
+    while queue:
+        path = queue.popleft()
+        file_path = os.path.join(base_dir, path)
+        reachable.append(file_path)
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            print(f"Error reading {path}: {e}")
+            continue
+
+        for specifier in cache.specifiers(path, data):
+            # Packages are not part of the collection
+            if not specifier.startswith(('.', '/')):
+                continue
+            resolved = resolver.resolve(path, specifier)
+            if isinstance(resolved, str) and resolved not in seen:
+                seen.add(resolved)
+                queue.append(resolved)
+
+    cache.save()
+    return reachable
+
+def relative_path(file_path, base_dir=None):
+    """The path a file is labelled with in the output."""
+    if base_dir:
+        return os.path.relpath(file_path, base_dir).replace(os.sep, '/')
+    return os.path.basename(file_path)
+
+def build_manifest(file_paths, base_dir=None, previous=None):
+    """Map the output path of each file to its size, mtime, sha256 and change count.
+
+    Files whose size and mtime match the previous manifest keep their
+    stored hash instead of being read again.
+    """
+    previous = previous or {}
+    manifest = {}
+    for file_path in file_paths:
+        if not should_include_file(os.path.abspath(file_path)):
+            continue
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            # Unreadable files are not collected either
+            continue
+        rel_path = relative_path(file_path, base_dir)
+        entry = previous.get(rel_path)
+        if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns:
+            manifest[rel_path] = entry
+            continue
+        try:
+            digest = hash_file(file_path)
+        except OSError:
+            continue
+        # How often the content changed between runs, used by --order stable
+        changes = 0
+        if entry:
+            changes = entry.get('changes', 0) + (entry['sha256'] != digest)
+        manifest[rel_path] = {'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'sha256': digest, 'changes': changes}
+    return manifest
+
+def load_manifest(manifest_file):
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        return json.load(f)['files']
+
+def save_manifest(manifest_file, manifest):
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump({'files': manifest}, f, indent=1, sort_keys=True)
+
+def changes_since_manifest(manifest, previous):
+    """Compare two manifests; returns the (added, modified, deleted) output paths."""
+    added = {path for path in manifest if path not in previous}
+    modified = {path for path in manifest
+                if path in previous and manifest[path]['sha256'] != previous[path]['sha256']}
+    deleted = sorted(path for path in previous if path not in manifest)
+    return added, modified, deleted
+
+def _git(base_dir, *args):
+    result = subprocess.run(['git', '-C', base_dir, *args], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"git {args[0]} failed")
+    return result.stdout
+
+def changes_since_git(ref, base_dir, source_dir):
+    """List the files under source_dir that changed since a git ref, including untracked ones.
+
+    Returns the (added, modified, deleted) paths relative to base_dir.
+    """
+    pathspec = os.path.relpath(os.path.abspath(source_dir), base_dir)
+    added, modified, deleted = set(), set(), []
+    output = _git(base_dir, 'diff', '--name-status', '--no-renames', '--relative', ref, '--', pathspec)
+    for line in output.splitlines():
+        status, _, path = line.partition('\t')
+        if status == 'A':
+            added.add(path)
+        elif status == 'D':
+            deleted.append(path)
+        elif path:
+            modified.add(path)
+    output = _git(base_dir, 'ls-files', '--others', '--exclude-standard', '--', pathspec)
+    added.update(output.splitlines())
+    return added, modified, sorted(deleted)
+
+def git_diff(ref, base_dir, rel_path):
+    return _git(base_dir, 'diff', '--relative', ref, '--', rel_path)
+
+# Files that rarely change go first in --order stable, in this order
+STABLE_CATEGORIES = [
+    re.compile(r'(^|/)(package\.json|tsconfig[^/]*\.json|[^/]*\.config\.[^/]+|index\.html)$'),
+    re.compile(r'(^|/)(types?(\.d)?\.tsx?|[^/]*\.d\.ts)$|(^|/)types/'),
+    re.compile(r'(^|/)(data|constants?)(\.[^/]+|/)|\.json$'),
+    re.compile(r'\.css$'),
+]
+
+def file_category(rel_path):
+    for rank, pattern in enumerate(STABLE_CATEGORIES):
+        if pattern.search(rel_path):
+            return rank
+    return len(STABLE_CATEGORIES)
+
+def git_churn(base_dir, source_dir, max_commits=1000):
+    """Count the commits touching each file under source_dir; empty outside a git repository."""
+    pathspec = os.path.relpath(os.path.abspath(source_dir), base_dir)
+    try:
+        output = _git(base_dir, 'log', f'--max-count={max_commits}', '--format=', '--name-only',
+                      '--relative', '--', pathspec)
+    except (OSError, RuntimeError):
+        return {}
+    churn = {}
+    for path in output.splitlines():
+        if path:
+            churn[path] = churn.get(path, 0) + 1
+    return churn
+
+def stable_order(file_paths, base_dir=None, churn=None):
+    """Sort files deterministically, least frequently changed first.
+
+    Files with equal churn are ordered by category (configs, types, data,
+    styles, then the rest) and path, so the output is byte for byte the
+    same for the same tree and edits land as late in it as possible.
+    Files missing from churn are new or untracked, so they go after every
+    file with a known history.
+    """
+    churn = churn or {}
+    unknown = max(churn.values(), default=-1) + 1
+
+    def key(file_path):
+        rel_path = relative_path(file_path, base_dir)
+        return churn.get(rel_path, unknown), file_category(rel_path), rel_path
+
+    return sorted(file_paths, key=key)
+
+def shared_prefix_length(a, b, chunk_size=1 << 16):
+    """Length of the common prefix of two byte strings."""
+    length = min(len(a), len(b))
+    offset = 0
+    # Skip equal chunks at memcmp speed, then find the first differing byte
+    while offset < length and a[offset:offset + chunk_size] == b[offset:offset + chunk_size]:
+        offset += chunk_size
+    end = min(offset + chunk_size, length)
+    while offset < end and a[offset] == b[offset]:
+        offset += 1
+    return min(offset, length)
+
+def write_deleted(output_file, deleted):
+    with open(output_file, 'a', encoding='utf-8') as output:
+        output.write("Deleted files:\n")
+        for path in deleted:
+            output.write(f"- {path}\n")
+        output.write("\n")
 
 def main():
     parser = argparse.ArgumentParser(description='Collect file contents into a single output file.')
     parser.add_argument('--source', default='src', help='Source file or directory to process (default: src)')
     parser.add_argument('--output', default='output.txt', help='Output file path (default: output.txt)')
+    parser.add_argument('--entry', action='append', default=[], help='Only collect files reachable from this entry file through relative imports (repeatable)')
+    parser.add_argument('--compact', action='store_true', help='Normalize whitespace and halve indentation to shrink the output')
+    parser.add_argument('--strip-comments', action='store_true', help='With --compact, also drop whole-line comments')
+    parser.add_argument('--manifest', default=None, help='Write a manifest of the collected files (path, size, mtime, sha256) to this file')
+    parser.add_argument('--since', default=None, help='Only emit files changed since a git ref or a manifest written by --manifest')
+    parser.add_argument('--diff', action='store_true', help='With --since <git-ref>, emit unified diffs for modified files')
+    parser.add_argument('--order', choices=['walk', 'stable'], default='walk', help='Block order: filesystem walk order, or stable with rarely changed files first (default: walk)')
+    parser.add_argument('--max-file-size', type=int, default=DEFAULT_MAX_FILE_SIZE, help=f'Files above this many bytes follow the large file rules, 0 to disable (default: {DEFAULT_MAX_FILE_SIZE})')
+    parser.add_argument('--large-file', action='append', default=[], type=parse_large_file_rule, metavar='GLOB=ACTION', help='Rule for large files matching GLOB, ACTION is skip, sample or summary; checked before the defaults (repeatable)')
+    parser.add_argument('--sample-bytes', type=int, default=DEFAULT_SAMPLE_BYTES, help=f'Bytes kept from the head and from the tail of sampled files (default: {DEFAULT_SAMPLE_BYTES})')
+    parser.add_argument('--import-cache', default=None, help='JSON file caching parsed imports between --entry runs (default: no cache)')
     
     args = parser.parse_args()
     
@@ -127,19 +636,108 @@ def main():
         return
     
     # Check if source is a file or directory
-    if os.path.isfile(args.source):
+    if args.entry:
+        for entry in args.entry:
+            if not os.path.isfile(entry):
+                print(f"Error: Entry '{entry}' does not exist.")
+                return
+        print(f"Processing files reachable from: {', '.join(args.entry)}")
+        base_dir = os.path.dirname(os.path.abspath(args.source))
+        file_paths = collect_reachable(args.entry, base_dir, ImportCache(args.import_cache))
+    elif os.path.isfile(args.source):
         print(f"Processing file: {args.source}")
-        # Clear the output file first
-        with open(args.output, 'w', encoding='utf-8') as output:
-            pass
-        process_file(args.source, args.output)
+        base_dir = None
+        file_paths = [os.path.abspath(args.source)]
     elif os.path.isdir(args.source):
         print(f"Processing directory: {args.source}")
-        process_directory(args.source, args.output)
+        base_dir = os.path.dirname(os.path.abspath(args.source))
+        file_paths = list(list_directory(os.path.abspath(args.source)))
     else:
         print(f"Error: Source '{args.source}' is neither a file nor a directory.")
         return
-    
+
+    all_paths = file_paths
+    manifest = None
+    previous = None
+    if args.manifest and os.path.isfile(args.manifest):
+        previous = load_manifest(args.manifest)
+
+    if args.order == 'stable':
+        since_manifest = bool(args.since) and os.path.isfile(args.since)
+        if args.manifest and not since_manifest:
+            # Counting the current run's changes moves an edited file back on its first edit
+            manifest = build_manifest(all_paths, base_dir, previous)
+            history = manifest
+        else:
+            history = previous or (load_manifest(args.since) if since_manifest else None)
+        if history:
+            # Files new since the previous manifest have no history yet
+            known = previous if history is manifest and previous else history
+            churn = {path: entry.get('changes', 0) for path, entry in history.items() if path in known}
+        elif base_dir:
+            churn = git_churn(base_dir, args.source)
+        else:
+            churn = {}
+        file_paths = stable_order(file_paths, base_dir, churn)
+
+    previous_output = None
+    if args.order == 'stable' and os.path.isfile(args.output):
+        with open(args.output, 'rb') as f:
+            previous_output = f.read()
+
+    deleted = []
+    diffs = {}
+    if args.since:
+        if os.path.isfile(args.since):
+            previous = load_manifest(args.since) if args.since != args.manifest else previous
+            manifest = build_manifest(file_paths, base_dir, previous)
+            added, modified, deleted = changes_since_manifest(manifest, previous)
+        else:
+            if base_dir is None:
+                print("Error: --since <git-ref> needs a source directory.")
+                return
+            try:
+                added, modified, deleted = changes_since_git(args.since, base_dir, args.source)
+                if args.diff:
+                    diffs = {path: git_diff(args.since, base_dir, path) for path in sorted(modified)}
+            except (OSError, RuntimeError) as e:
+                print(f"Error: '{args.since}' is neither a manifest nor a usable git ref: {e}")
+                return
+        changed = added | modified
+        file_paths = [path for path in file_paths if relative_path(path, base_dir) in changed]
+        print(f"Changes since {args.since}: {len(added)} added, {len(modified)} modified, {len(deleted)} deleted")
+
+    policy = LargeFilePolicy(args.max_file_size, args.large_file + DEFAULT_LARGE_FILE_RULES, args.sample_bytes)
+
+    # Clear the output file first
+    with open(args.output, 'w', encoding='utf-8') as output:
+        pass
+
+    saved = 0
+    for file_path in file_paths:
+        diff = diffs.get(relative_path(file_path, base_dir))
+        if diff:
+            with open(args.output, 'a', encoding='utf-8') as output:
+                output.write(f"```diff\n{diff}```\n\n")
+        else:
+            saved += process_file(file_path, args.output, base_dir, args.compact, args.strip_comments, policy)
+    if deleted:
+        write_deleted(args.output, deleted)
+
+    if args.manifest:
+        if manifest is None:
+            manifest = build_manifest(all_paths, base_dir, previous)
+        save_manifest(args.manifest, manifest)
+        print(f"Manifest written to: {args.manifest}")
+
+    if previous_output is not None:
+        with open(args.output, 'rb') as f:
+            current_output = f.read()
+        shared = shared_prefix_length(previous_output, current_output)
+        print(f"Shared prefix with previous output: {shared} of {len(current_output)} bytes")
+
+    if args.compact:
+        print(f"Compact mode saved {saved} bytes (~{estimate_tokens(saved)} tokens)")
     print(f"Output written to: {args.output}")
 
 if __name__ == "__main__":
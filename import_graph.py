@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import sys
+import json
+import argparse
+import posixpath
+
+from extract_solution import extract_solution_from_file
+from solution_writer import normalize_path
+from workspace import TEMPLATE_IGNORE, walk_files
+
+SCRIPT_EXTENSIONS = {'.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs', '.mts', '.cts'}
+
+# Extensions Vite tries, in order, for specifiers without one
+RESOLVE_EXTENSIONS = ('.mjs', '.js', '.mts', '.ts', '.jsx', '.tsx', '.json')
+
+# TypeScript lets a '.js' specifier name the '.ts' source it compiles from
+TS_EXTENSION_ALIASES = {
+    '.js': ('.ts', '.tsx'),
+    '.jsx': ('.tsx',),
+    '.mjs': ('.mts',),
+    '.cjs': ('.cts',),
+}
+
+# Vite serves the public directory at the site root
+PUBLIC_DIR = 'public'
+
+_STATIC_IMPORT = re.compile(r'^[ \t]*import\b(?:[^\'";]*?\bfrom)?\s*([\'"])([^\'"\n]+)\1', re.MULTILINE)
+_REEXPORT = re.compile(r'^[ \t]*export\b[^\'";]*?\bfrom\s*([\'"])([^\'"\n]+)\1', re.MULTILINE)
+_DYNAMIC_IMPORT = re.compile(r'\b(?:import|require)\s*\(\s*([\'"])([^\'"\n]+)\1')
+_HTML_SCRIPT = re.compile(r'<script\b[^>]*\bsrc\s*=\s*([\'"])([^\'"]+)\1', re.IGNORECASE)
+_CSS_IMPORT = re.compile(r'@import\s+(?:url\(\s*)?([\'"])([^\'"\n]+)\1')
+
+def _line(source: str, position: int) -> int:
+    return source.count('\n', 0, position) + 1
+
+def scan_imports(file_name: str, code: str) -> list[tuple[int, str]]:
+    """Returns the (line, specifier) of every import in a script, stylesheet or HTML file."""
+    ext = os.path.splitext(file_name)[1].lower()
+    if ext in SCRIPT_EXTENSIONS:
+        patterns = (_STATIC_IMPORT, _REEXPORT, _DYNAMIC_IMPORT)
+    elif ext == '.css':
+        patterns = (_CSS_IMPORT,)
+    elif ext == '.html':
+        patterns = (_HTML_SCRIPT,)
+    else:
+        return []
+
+    found = []
+    for pattern in patterns:
+        for match in pattern.finditer(code):
+            found.append((_line(code, match.start(2)), match.group(2)))
+    found.sort()
+    return found
+
+def package_name(specifier: str) -> str:
+    parts = specifier.split('/')
+    return '/'.join(parts[:2]) if specifier.startswith('@') else parts[0]
+
+class ProjectFiles:
+    """The file set Vite would see: the template tree with the solution written over it."""
+
+    def __init__(self, paths, packages=None):
+        self.paths = set(paths)
+        self.directories = set()
+        for path in self.paths:
+            directory = posixpath.dirname(path)
+            while directory and directory not in self.directories:
+                self.directories.add(directory)
+                directory = posixpath.dirname(directory)
+        # None when the dependencies are unknown, so bare imports are not checked
+        self.packages = packages
+
+    @classmethod
+    def from_template(cls, template_dir: str, extra_paths=()) -> 'ProjectFiles':
+        paths = [path.replace(os.sep, '/') for path in walk_files(template_dir, TEMPLATE_IGNORE)]
+        packages = None
+        package_json = os.path.join(template_dir, 'package.json')
+        if os.path.isfile(package_json):
+            with open(package_json, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            packages = set()
+            for field in ('dependencies', 'devDependencies', 'peerDependencies', 'optionalDependencies'):
+                packages.update(manifest.get(field, {}))
+        return cls(paths + list(extra_paths), packages)
+
+    def is_file(self, path: str) -> bool:
+        return path in self.paths
+
+    def is_dir(self, path: str) -> bool:
+        return path in self.directories
+
+    def _resolve_file(self, path: str) -> str | None:
+        if self.is_file(path):
+            return path
+        root, ext = posixpath.splitext(path)
+        for alias in TS_EXTENSION_ALIASES.get(ext, ()):
+            if self.is_file(root + alias):
+                return root + alias
+        for ext in RESOLVE_EXTENSIONS:
+            if self.is_file(path + ext):
+                return path + ext
+        if self.is_dir(path):
+            for ext in RESOLVE_EXTENSIONS:
+                if self.is_file(f"{path}/index{ext}"):
+                    return f"{path}/index{ext}"
+        return None
+
+    def resolve(self, importer: str, specifier: str) -> str | bool | None:
+        """Resolves specifier as imported from the importer path.
+
+        Returns the resolved path, True for a package or asset that exists
+        outside the file set, or None if nothing matches.
+        """
+        specifier = specifier.split('?', 1)[0].split('#', 1)[0]
+        if specifier.startswith(('./', '../')) or specifier in ('.', '..'):
+            path = posixpath.normpath(posixpath.join(posixpath.dirname(importer), specifier))
+            if path.startswith('../'):
+                return None
+            return self._resolve_file(path)
+        if specifier.startswith('/'):
+            path = posixpath.normpath(specifier.lstrip('/'))
+            resolved = self._resolve_file(path)
+            if resolved is None and self.is_file(f"{PUBLIC_DIR}/{path}"):
+                return True
+            return resolved
+        if ':' in specifier:
+            # node:fs, virtual:*, https://... are outside the file set
+            return True
+        if self.packages is None or package_name(specifier) in self.packages:
+            return True
+        return None
+
+class DiskFiles(ProjectFiles):
+    """Resolves against a directory on disk, without walking it up front."""
+
+    def __init__(self, root: str, packages=None):
+        super().__init__((), packages)
+        self.root = os.path.abspath(root)
+
+    def is_file(self, path: str) -> bool:
+        return os.path.isfile(os.path.join(self.root, path))
+
+    def is_dir(self, path: str) -> bool:
+        return os.path.isdir(os.path.join(self.root, path))
+
+def find_cycles(graph: dict[str, list[str]]) -> list[list[str]]:
+    """Returns the import cycles of graph as sorted lists of paths (Tarjan's SCC)."""
+    index, lowlink, on_stack = {}, {}, set()
+    stack, cycles = [], []
+    counter = 0
+
+    for start in sorted(graph):
+        if start in index:
+            continue
+        # Iterative DFS so deep import chains cannot hit the recursion limit
+        work = [(start, iter(graph.get(start, ())))]
+        index[start] = lowlink[start] = counter
+        counter += 1
+        stack.append(start)
+        on_stack.add(start)
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = lowlink[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(graph.get(successor, ()))))
+                    break
+                if successor in on_stack:
+                    lowlink[node] = min(lowlink[node], index[successor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in graph.get(node, ()):
+                        cycles.append(sorted(component))
+    return sorted(cycles)
+
+def check_imports(blocks: list[tuple[str, str]], template_dir: str = '.') -> dict:
+    """Resolves the imports of the extracted files against the solution plus the template.
+
+    Returns a dict with 'missing', a list of (path, line, specifier) for
+    imports that resolve to nothing, 'cycles', the import cycles among
+    the solution's files, and 'invalid', the (file name, error) of blocks
+    skipped because their file name is not a usable path.
+    """
+    files = {}
+    invalid = []
+    for file_name, code in blocks:
+        try:
+            files[normalize_path(file_name).replace(os.sep, '/')] = code
+        except ValueError as e:
+            invalid.append((file_name, str(e)))
+
+    project = ProjectFiles.from_template(template_dir, files)
+
+    # The template's index.html is the entry Vite loads, so check it too
+    sources = dict(files)
+    index_html = os.path.join(template_dir, 'index.html')
+    if 'index.html' not in sources and os.path.isfile(index_html):
+        with open(index_html, 'r', encoding='utf-8') as f:
+            sources['index.html'] = f.read()
+
+    missing = []
+    graph = {}
+    for path, code in sources.items():
+        edges = graph.setdefault(path, [])
+        for line, specifier in scan_imports(path, code):
+            resolved = project.resolve(path, specifier)
+            if resolved is None:
+                missing.append((path, line, specifier))
+            elif resolved is not True and resolved in files:
+                edges.append(resolved)
+
+    return {'missing': missing, 'cycles': find_cycles(graph), 'invalid': invalid}
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that the imports of an LLM response resolve.')
+    parser.add_argument('response', help='File holding the LLM response')
+    parser.add_argument('--template', default='.', help='App template directory (default: .)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.template):
+        print(f"Error: Template '{args.template}' does not exist.")
+        return
+
+    result = check_imports(extract_solution_from_file(args.response), args.template)
+
+    if args.json:
+        json.dump(result, sys.stdout, indent=2)
+        print()
+    else:
+        for file_name, error in result['invalid']:
+            print(f"Skipped block '{file_name}': {error}")
+        for path, line, specifier in result['missing']:
+            print(f"{path}:{line}: Cannot resolve '{specifier}'")
+        for cycle in result['cycles']:
+            print(f"Import cycle among: {', '.join(cycle)}")
+
+    # Cycles are legal ES modules, only unresolved imports fail the check
+    if result['missing']:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
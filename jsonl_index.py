@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import mmap
+import struct
+import argparse
+
+# Sidecar layout: header, then one (offset, length) pair per record
+MAGIC = b'JSONLIDX'
+VERSION = 1
+HEADER = struct.Struct('<8sIQQ')  # magic, version, bytes of the data file indexed, records
+ENTRY = struct.Struct('<QQ')
+
+def index_path(data_file: str) -> str:
+    return f"{data_file}.idx"
+
+def _read_header(index_file):
+    with open(index_file, 'rb') as f:
+        data = f.read(HEADER.size)
+    if len(data) != HEADER.size:
+        return None
+    magic, version, indexed, count = HEADER.unpack(data)
+    if magic != MAGIC or version != VERSION:
+        return None
+    return indexed, count
+
+def update_index(data_file: str) -> int:
+    """Creates or extends the sidecar index of data_file; returns the number of records.
+
+    Only bytes appended since the last update are read. A trailing line
+    without a newline is left for the next update, since it may still be
+    being written. If the data file shrank, the index is rebuilt.
+    """
+    index_file = index_path(data_file)
+    header = _read_header(index_file) if os.path.exists(index_file) else None
+    if header is None or header[0] > os.path.getsize(data_file):
+        with open(index_file, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 0, 0))
+        header = (0, 0)
+    indexed, count = header
+
+    entries = []
+    offset = indexed
+    with open(data_file, 'rb', buffering=1 << 20) as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            if line.strip():
+                entries.append(ENTRY.pack(offset, len(line) - 1))
+            offset += len(line)
+
+    with open(index_file, 'r+b') as f:
+        # Entries past the header's count come from an interrupted update
+        f.seek(HEADER.size + count * ENTRY.size)
+        f.write(b''.join(entries))
+        f.truncate()
+        # The header is written last so an interrupted update is redone next time
+        count += len(entries)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, offset, count))
+
+    return count
+
+class JsonlIndex:
+    """Random access to the records of a JSONL file through its sidecar index."""
+
+    def __init__(self, data_file: str, update: bool = True):
+        if update:
+            update_index(data_file)
+        self._data_file = open(data_file, 'rb')
+        self._index_file = open(index_path(data_file), 'rb')
+        self._data = mmap.mmap(self._data_file.fileno(), 0, access=mmap.ACCESS_READ) \
+            if os.path.getsize(data_file) else b''
+        self._index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._count = HEADER.unpack_from(self._index)[3]
+
+    def __len__(self):
+        return self._count
+
+    def raw(self, k: int) -> bytes:
+        """Returns the bytes of record k, without its newline."""
+        if k < 0:
+            k += self._count
+        if not 0 <= k < self._count:
+            raise IndexError(f"Record {k} out of range")
+        offset, length = ENTRY.unpack_from(self._index, HEADER.size + k * ENTRY.size)
+        return self._data[offset:offset + length]
+
+    def __getitem__(self, k: int) -> dict:
+        return json.loads(self.raw(k))
+
+    def records(self, start: int = 0, stop: int = None):
+        """Yields the parsed records start..stop-1."""
+        for k in range(*slice(start, stop).indices(self._count)):
+            yield self[k]
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._index.close()
+        self._data_file.close()
+        self._index_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Index a JSONL file by byte offset and fetch records from it.')
+    parser.add_argument('data_file', help='JSONL file')
+    parser.add_argument('start', nargs='?', type=int, help='First record to print (default: only update the index)')
+    parser.add_argument('stop', nargs='?', type=int, help='Record after the last one to print (default: start + 1)')
+
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.data_file):
+        print(f"Error: File '{args.data_file}' does not exist.")
+        return
+
+    count = update_index(args.data_file)
+    if args.start is None:
+        print(f"Indexed {count} records in: {index_path(args.data_file)}")
+        return
+
+    start = args.start + count if args.start < 0 else args.start
+    stop = start + 1 if args.stop is None else args.stop
+    with JsonlIndex(args.data_file, update=False) as index:
+        for k in range(*slice(start, stop).indices(len(index))):
+            sys.stdout.write(index.raw(k).decode('utf-8') + '\n')
+
+if __name__ == "__main__":
+    main()
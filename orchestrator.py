@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import asyncio
+import argparse
+import collections
+import contextlib
+
+from extract_solution import extract_solution
+from evaluation_cache import EvaluationCache, harness_digest
+from dependency_store import LINK_MODES, DependencyStore
+from readiness import ReadyLineWatcher, wait_until_ready
+from tracing import Tracer, format_summary, summarize as summarize_stages
+from workspace import WorkspaceManager
+
+READY_TIMEOUT = 30.0
+
+class PortAllocator:
+    """Hands out free local TCP ports, never the same one to two running jobs."""
+
+    def __init__(self):
+        self._in_use = set()
+
+    def acquire(self) -> int:
+        while True:
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                sock.bind(('127.0.0.1', 0))
+                port = sock.getsockname()[1]
+            if port not in self._in_use:
+                self._in_use.add(port)
+                return port
+
+    def release(self, port: int) -> None:
+        self._in_use.discard(port)
+
+async def _drain(stream, lines):
+    """Keeps the last lines of a process output so its pipe never fills up."""
+    while True:
+        line = await stream.readline()
+        if not line:
+            return
+        lines.append(line.decode('utf-8', 'replace').rstrip())
+
+async def _start(*command, cwd, env):
+    return await asyncio.create_subprocess_exec(
+        *command,
+        cwd=cwd,
+        env=env,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        start_new_session=True,
+    )
+
+async def _stop(process, grace=5.0):
+    """Terminates a process and everything it spawned."""
+    if process is None or process.returncode is not None:
+        return
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        await asyncio.wait_for(process.wait(), grace)
+    except ProcessLookupError:
+        pass
+    except asyncio.TimeoutError:
+        os.killpg(process.pid, signal.SIGKILL)
+        await process.wait()
+
+class Orchestrator:
+    """Evaluates submissions concurrently, each in its own workspace and port.
+
+    Workspaces are pooled and reset from the template manifest between jobs.
+    """
+
+    def __init__(self, template_dir, eval_dir, work_dir, concurrency=None,
+                 timeout=600.0, keep_workspaces=False, deps_store=None, link_mode='symlink',
+                 cache_dir=None, tracer=None):
+        self.template_dir = os.path.abspath(template_dir)
+        self.eval_dir = os.path.abspath(eval_dir)
+        self.work_dir = os.path.abspath(work_dir)
+        self.concurrency = concurrency or max(1, (os.cpu_count() or 2) // 2)
+        self.timeout = timeout
+        self.keep_workspaces = keep_workspaces
+        self.deps_store = deps_store
+        self.link_mode = link_mode
+        self.tracer = tracer or Tracer()
+        self.ports = PortAllocator()
+        self.workspaces = WorkspaceManager(self.template_dir, self.work_dir)
+        self.cache = None
+        if cache_dir:
+            harness = harness_digest(self.workspaces.manifest, self.eval_dir)
+            self.cache = EvaluationCache(harness, cache_dir)
+
+    def prepare_workspace(self, job_id, blocks):
+        """Resets a pooled copy of the app template and writes the extracted solution into it."""
+        with self.tracer.span('workspace_reset', job_id):
+            workspace, created = self.workspaces.acquire()
+
+        try:
+            if created:
+                with self.tracer.span('dependencies', job_id):
+                    if self.deps_store:
+                        self.deps_store.populate(workspace.path, self.template_dir, self.link_mode)
+                    else:
+                        node_modules = os.path.join(self.template_dir, 'node_modules')
+                        if os.path.isdir(node_modules):
+                            os.symlink(node_modules, os.path.join(workspace.path, 'node_modules'))
+
+            with self.tracer.span('write_files', job_id, files=len(blocks)):
+                summary = workspace.apply(blocks)
+        except BaseException:
+            self.workspaces.release(workspace)
+            raise
+        return workspace, summary
+
+    async def run_job(self, job_id, llm_response, semaphore=None):
+        """Evaluates one submission; semaphore, if given, bounds concurrent evaluations."""
+        with self.tracer.span('job', job_id):
+            return await self._run_job(job_id, llm_response, semaphore)
+
+    async def _run_job(self, job_id, llm_response, semaphore):
+        with self.tracer.span('extract', job_id, chars=len(llm_response)):
+            blocks = extract_solution(llm_response)
+        if self.cache is None:
+            return await self._evaluate_limited(semaphore, job_id, blocks)
+
+        key = self.cache.key(blocks)
+        # A duplicate waits here, before taking a concurrency slot or starting
+        # its timeout. Poll instead of blocking a thread, so a cancelled job
+        # never leaves the lock held.
+        while True:
+            try:
+                lock = self.cache.lock(key, blocking=False)
+                break
+            except BlockingIOError:
+                await asyncio.sleep(0.5)
+
+        try:
+            with self.tracer.span('cache_lookup', job_id):
+                cached = self.cache.get(key)
+            if cached is not None:
+                return dict(cached, id=job_id, cached=True)
+            result = await self._evaluate_limited(semaphore, job_id, blocks)
+            self.cache.set(key, result)
+            return result
+        finally:
+            lock.close()
+
+    async def evaluate(self, job_id, workspace, summary):
+        """Serves a prepared workspace and runs the eval suite against it."""
+        result = {'id': job_id, 'status': 'error', 'exit_code': None, 'port': None}
+        started = time.monotonic()
+        server = tests = drain = watcher = None
+        test_log = collections.deque(maxlen=200)
+        port = self.ports.acquire()
+        result['port'] = port
+
+        try:
+            result['files_written'] = len(summary['written']) + len(summary['unchanged'])
+            result['files_failed'] = summary['failed']
+
+            # Vite's dependency cache must not be shared through a linked node_modules
+            env = dict(os.environ, PORT=str(port), CYPRESS_BASE_URL=f"http://localhost:{port}",
+                       VITE_CACHE_DIR=os.path.join(workspace.path, '.vite'))
+            # Created here so ready_line_seconds only counts the server's own startup
+            watcher = ReadyLineWatcher()
+            with self.tracer.span('server_start', job_id):
+                server = await _start('npx', 'vite', '--port', str(port), '--strictPort', cwd=workspace.path, env=env)
+            drain = asyncio.create_task(watcher.watch(server.stdout))
+
+            with self.tracer.span('readiness', job_id):
+                result['ready_seconds'] = await wait_until_ready('localhost', port, timeout=READY_TIMEOUT)
+            result['ready_line_seconds'] = watcher.ready_after
+            if result['ready_seconds'] is None:
+                result['error'] = 'Frontend failed to start'
+                return result
+
+            artifacts = os.path.join(workspace.path, 'cypress-artifacts')
+            with self.tracer.span('cypress', job_id):
+                tests = await _start(
+                    'npx', 'cypress', 'run', '--headless', '--browser', 'chrome',
+                    '--config', f"baseUrl=http://localhost:{port},"
+                                f"videosFolder={artifacts}/videos,screenshotsFolder={artifacts}/screenshots",
+                    cwd=self.eval_dir, env=env,
+                )
+                await _drain(tests.stdout, test_log)
+                result['exit_code'] = await tests.wait()
+            result['status'] = 'passed' if result['exit_code'] == 0 else 'failed'
+            return result
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+            return result
+        finally:
+            with self.tracer.span('teardown', job_id):
+                await _stop(tests)
+                await _stop(server)
+                if drain:
+                    await drain
+            self.ports.release(port)
+            result['duration'] = time.monotonic() - started
+            result['server_log'] = watcher.lines[-10:] if watcher else []
+            result['test_log'] = list(test_log)[-20:]
+
+    async def _evaluate_limited(self, semaphore, job_id, blocks):
+        async with semaphore or contextlib.nullcontext():
+            # Prepared outside the timeout: wait_for cannot stop the worker
+            # thread, so a timed-out preparation would leak its workspace
+            try:
+                workspace, summary = await asyncio.to_thread(self.prepare_workspace, job_id, blocks)
+            except Exception as e:
+                return {'id': job_id, 'status': 'error', 'exit_code': None, 'error': f"{type(e).__name__}: {e}"}
+            try:
+                return await asyncio.wait_for(self.evaluate(job_id, workspace, summary), self.timeout)
+            except asyncio.TimeoutError:
+                return {'id': job_id, 'status': 'timeout', 'exit_code': None, 'duration': self.timeout}
+            finally:
+                self.workspaces.release(workspace)
+
+    async def run(self, submissions):
+        """Evaluates (job_id, llm_response) pairs; results come back in input order."""
+        os.makedirs(self.work_dir, exist_ok=True)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(*(
+            self.run_job(job_id, llm_response, semaphore)
+            for job_id, llm_response in submissions
+        ))
+        if not self.keep_workspaces:
+            await asyncio.to_thread(self.workspaces.remove_all)
+        return results
+
+def read_submissions(input_file, field='response'):
+    """Reads (job_id, llm_response) pairs from a JSONL file."""
+    submissions = []
+    with open(input_file, 'r', encoding='utf-8') as f:
+        for index, line in enumerate(f):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            job_id = record.get('request_id', record.get('id', index))
+            submissions.append((job_id, record[field]))
+    return submissions
+
+def summarize(results):
+    counts = collections.Counter(result['status'] for result in results)
+    cached = sum(1 for result in results if result.get('cached'))
+    return {'total': len(results), **counts, 'cached': cached}
+
+def main():
+    parser = argparse.ArgumentParser(description='Evaluate LLM submissions concurrently against the Cypress suite.')
+    parser.add_argument('input', help='JSONL file with one submission per line')
+    parser.add_argument('--field', default='response', help='Record field holding the LLM response (default: response)')
+    parser.add_argument('--template', default='.', help='App template directory (default: .)')
+    parser.add_argument('--eval-dir', default='eval', help='Directory of the Cypress suite (default: eval)')
+    parser.add_argument('--work-dir', default='workspaces', help='Where job workspaces are created (default: workspaces)')
+    parser.add_argument('--concurrency', type=int, default=None, help='Jobs run at once (default: half the CPU count)')
+    parser.add_argument('--timeout', type=float, default=600.0, help='Per-job timeout in seconds (default: 600)')
+    parser.add_argument('--deps-store', default=None, help='Shared node_modules store directory (default: link the template node_modules)')
+    parser.add_argument('--link-mode', choices=LINK_MODES, default='symlink', help='How workspaces get node_modules from the store (default: symlink)')
+    parser.add_argument('--cache-dir', default=None, help='Reuse stored results of identical evaluations from this directory')
+    parser.add_argument('--trace', default=None, help='Write a Chrome trace of every job stage to this file')
+    parser.add_argument('--keep-workspaces', action='store_true', help='Keep job workspaces after they finish')
+    parser.add_argument('--output', default='results.json', help='Aggregated results file (default: results.json)')
+
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.input):
+        print(f"Error: Input '{args.input}' does not exist.")
+        return
+    if not os.path.isdir(args.eval_dir):
+        print(f"Error: Eval directory '{args.eval_dir}' does not exist.")
+        return
+
+    deps_store = DependencyStore(args.deps_store) if args.deps_store else None
+    orchestrator = Orchestrator(args.template, args.eval_dir, args.work_dir, args.concurrency,
+                                args.timeout, args.keep_workspaces, deps_store, args.link_mode,
+                                args.cache_dir)
+    submissions = read_submissions(args.input, args.field)
+    print(f"Evaluating {len(submissions)} submissions, {orchestrator.concurrency} at a time...")
+
+    results = asyncio.run(orchestrator.run(submissions))
+    print(format_summary(summarize_stages(orchestrator.tracer.events)))
+    if args.trace:
+        orchestrator.tracer.save(args.trace)
+        print(f"Trace written to: {args.trace}")
+    summary = summarize(results)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'summary': summary, 'results': results}, f, indent=2)
+
+    print(', '.join(f"{status}: {count}" for status, count in summary.items()))
+    print(f"Results written to: {args.output}")
+    sys.exit(0 if summary.get('passed', 0) == summary['total'] else 1)
+
+if __name__ == "__main__":
+    main()
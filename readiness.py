@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+import re
+import sys
+import time
+import asyncio
+import argparse
+
+ANSI_ESCAPE = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+
+# Vite prints e.g. "VITE v6.3.1  ready in 312 ms" once it can serve requests
+VITE_READY_LINE = re.compile(r'\bready in\s+[\d.]+\s*m?s\b', re.IGNORECASE)
+
+def backoff_delays(initial=0.02, factor=2.0, maximum=0.5):
+    """Yields exponentially growing delays, capped at maximum."""
+    delay = initial
+    while True:
+        yield delay
+        delay = min(delay * factor, maximum)
+
+async def probe_http(host, port, path='/index.html', timeout=1.0) -> bool:
+    """Returns True if GET path answers with a 2xx status."""
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+
+    try:
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\nConnection: close\r\n\r\n".encode('ascii'))
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+    parts = status_line.split()
+    return len(parts) >= 2 and parts[1].startswith(b'2')
+
+async def wait_until_ready(host='localhost', port=5173, path='/index.html', timeout=30.0,
+                           initial_delay=0.02, max_delay=0.5) -> float | None:
+    """Polls the server with exponential backoff until it serves path.
+
+    Returns the seconds it took to become ready, or None on timeout.
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    for delay in backoff_delays(initial_delay, maximum=max_delay):
+        if await probe_http(host, port, path):
+            return time.monotonic() - started
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        await asyncio.sleep(min(delay, remaining))
+
+class ReadyLineWatcher:
+    """Reads a server's output and records when it prints its ready line."""
+
+    def __init__(self, pattern=VITE_READY_LINE, keep_lines=50):
+        self.pattern = pattern
+        self.lines = []
+        self.keep_lines = keep_lines
+        self.started = time.monotonic()
+        self.ready_after = None
+        self.ready = asyncio.Event()
+
+    async def watch(self, stream) -> None:
+        """Consumes stream until EOF, so the process never blocks on a full pipe."""
+        while True:
+            line = await stream.readline()
+            if not line:
+                return
+            text = ANSI_ESCAPE.sub('', line.decode('utf-8', 'replace')).rstrip()
+            self.lines.append(text)
+            del self.lines[:-self.keep_lines]
+            if self.ready_after is None and self.pattern.search(text):
+                self.ready_after = time.monotonic() - self.started
+                self.ready.set()
+
+def wait_for_server(host='localhost', port=5173, path='/index.html', timeout=30.0) -> float | None:
+    """Blocking version of wait_until_ready."""
+    return asyncio.run(wait_until_ready(host, port, path, timeout))
+
+def main():
+    parser = argparse.ArgumentParser(description='Wait until the frontend server really serves pages.')
+    parser.add_argument('--host', default='localhost', help='Server host (default: localhost)')
+    parser.add_argument('--port', type=int, default=5173, help='Server port (default: 5173)')
+    parser.add_argument('--path', default='/index.html', help='Path to GET (default: /index.html)')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Seconds to wait before giving up (default: 30)')
+
+    args = parser.parse_args()
+
+    elapsed = wait_for_server(args.host, args.port, args.path, args.timeout)
+    if elapsed is None:
+        print(f"Frontend on http://{args.host}:{args.port} not ready after {args.timeout}s.")
+        sys.exit(1)
+    print(f"Frontend is ready on http://{args.host}:{args.port} after {elapsed:.3f}s.")
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,24 @@
 
 set -e
 
+# Port of the frontend server, overridable to run several evaluations at once
+PORT="${PORT:-5173}"
+export PORT
+
 # Healthcheck function.
 wait_for_frontend() {
-	echo "Waiting for Frontend on http://localhost:5173 to be ready..."
+	echo "Waiting for Frontend on http://localhost:$PORT to be ready..."
+
+	# Probe with a short backoff and a real HTTP request when Python is available
+	if command -v python3 >/dev/null 2>&1 && [ -f /app/readiness.py ]; then
+		python3 /app/readiness.py --port "$PORT" --timeout 15
+		return $?
+	fi
 
 	for i in $(seq 1 5); do
-		# Check if port 5173 is open using a simple socket connection
-		if timeout 2 bash -c "</dev/tcp/localhost/5173" >/dev/null 2>&1; then
-			echo "Frontend is ready on http://localhost:5173."
+		# Check if port $PORT is open using a simple socket connection
+		if timeout 2 bash -c "</dev/tcp/localhost/$PORT" >/dev/null 2>&1; then
+			echo "Frontend is ready on http://localhost:$PORT."
 			return 0
 		fi
 
@@ -33,7 +43,7 @@ wait_for_frontend || exit 1
 # Run Cypress tests
 echo "Running Cypress tests..."
 cd /app/eval
-npx cypress run --headless --browser chrome
+npx cypress run --headless --browser chrome --config "baseUrl=http://localhost:$PORT"
 EVAL_EXIT_CODE=$?
 
 # Stop frontend server
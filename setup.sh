@@ -3,6 +3,11 @@
 
 cd /app
 
+# Link dependencies from a shared store instead of installing them when one is configured
+if [ -n "$NODE_MODULES_STORE" ] && command -v python3 >/dev/null 2>&1; then
+	python3 /app/dependency_store.py /app /app/eval && exit 0
+fi
+
 # Install frontend dependencies (clean install)
 echo "Installing frontend dependencies..."
 npm ci
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import difflib
+import hashlib
+import argparse
+
+from extract_solution import extract_all_code_blocks, extract_solution_from_file
+from file_collector import should_include_file
+from solution_writer import normalize_path
+
+def normalize_content(content: str) -> str:
+    """Drops trailing whitespace, which extraction and collection do not preserve."""
+    content = content.rstrip()
+    return content + '\n' if content else ''
+
+def content_digest(content: str) -> str:
+    return hashlib.sha1(normalize_content(content).encode('utf-8', 'surrogatepass'),
+                        usedforsecurity=False).hexdigest()
+
+def _key(file_name: str) -> str:
+    return normalize_path(file_name).replace(os.sep, '/')
+
+class BaselineIndex:
+    """Baseline files indexed by path and content hash.
+
+    Contents are only loaded again when a diff against them is requested.
+    """
+
+    def __init__(self):
+        # path -> (digest, loader returning the content)
+        self.entries = {}
+        self._contents = {}
+
+    def add(self, file_name: str, digest: str, loader) -> None:
+        self.entries[_key(file_name)] = (digest, loader)
+
+    def content(self, path: str) -> str:
+        if path not in self._contents:
+            self._contents[path] = normalize_content(self.entries[path][1]())
+        return self._contents[path]
+
+    @classmethod
+    def from_collector_output(cls, output_file: str) -> 'BaselineIndex':
+        """Indexes the blocks of a file_collector output file."""
+        with open(output_file, 'r', encoding='utf-8') as f:
+            result = extract_all_code_blocks(f.read())
+
+        index = cls()
+        for file_name, span in result.by_filename.items():
+            index.add(file_name, content_digest(span.code), lambda span=span: span.code)
+        return index
+
+    @classmethod
+    def from_tree(cls, root: str, source: str = 'src') -> 'BaselineIndex':
+        """Indexes the files file_collector would collect under root/source."""
+        index = cls()
+        for directory, _, files in os.walk(os.path.join(root, source)):
+            for file in files:
+                file_path = os.path.join(directory, file)
+                if not should_include_file(os.path.abspath(file_path)):
+                    continue
+                try:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        content = f.read()
+                except UnicodeDecodeError:
+                    continue
+
+                def loader(file_path=file_path):
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        return f.read()
+
+                index.add(os.path.relpath(file_path, root), content_digest(content), loader)
+        return index
+
+def compare(index: BaselineIndex, blocks, include_untouched: bool = False, context: int = 3) -> list[dict]:
+    """Compares extracted (file_path, file_content) tuples with the baseline.
+
+    Returns one dict per file with its 'path', its 'status' ('added',
+    'modified', 'unchanged', 'untouched' for baseline files the
+    submission did not emit, or 'invalid' with an 'error' for blocks whose
+    path cannot be written) and, for modified files, a unified 'diff'.
+    """
+    submitted = {}
+    results = []
+    for file_name, code in blocks:
+        try:
+            submitted[_key(file_name)] = code
+        except ValueError as e:
+            results.append({'path': file_name, 'status': 'invalid', 'error': str(e)})
+
+    for path, code in submitted.items():
+        entry = index.entries.get(path)
+        if entry is None:
+            results.append({'path': path, 'status': 'added'})
+        elif entry[0] == content_digest(code):
+            results.append({'path': path, 'status': 'unchanged'})
+        else:
+            diff = difflib.unified_diff(
+                index.content(path).splitlines(keepends=True),
+                normalize_content(code).splitlines(keepends=True),
+                fromfile=f'a/{path}',
+                tofile=f'b/{path}',
+                n=context,
+            )
+            results.append({'path': path, 'status': 'modified', 'diff': ''.join(diff)})
+
+    if include_untouched:
+        for path in index.entries:
+            if path not in submitted:
+                results.append({'path': path, 'status': 'untouched'})
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the files extracted from an LLM response with a baseline.')
+    parser.add_argument('response', help='File holding the LLM response')
+    parser.add_argument('--baseline', default='output.txt', help='file_collector output file or project directory (default: output.txt)')
+    parser.add_argument('--source', default='src', help='Source directory when --baseline is a directory (default: src)')
+    parser.add_argument('--untouched', action='store_true', help='Also list baseline files the response did not emit')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    args = parser.parse_args()
+
+    if os.path.isdir(args.baseline):
+        index = BaselineIndex.from_tree(args.baseline, args.source)
+    elif os.path.isfile(args.baseline):
+        index = BaselineIndex.from_collector_output(args.baseline)
+    else:
+        print(f"Error: Baseline '{args.baseline}' does not exist.")
+        return
+
+    results = compare(index, extract_solution_from_file(args.response), include_untouched=args.untouched)
+
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+        return
+
+    for result in results:
+        if result['status'] == 'invalid':
+            print(f"{result['status']:>9}  {result['error']}")
+        else:
+            print(f"{result['status']:>9}  {result['path']}")
+    for result in results:
+        if result.get('diff'):
+            print()
+            sys.stdout.write(result['diff'])
+
+if __name__ == "__main__":
+    main()
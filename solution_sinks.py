@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+import io
+import os
+import sys
+import time
+import tarfile
+import zipfile
+import argparse
+
+from extract_solution import extract_solution_from_file
+from solution_writer import normalize_path
+
+def _archive_name(file_name: str) -> str:
+    return normalize_path(file_name).replace(os.sep, '/')
+
+def _archive_entries(blocks, failed):
+    """Yields (archive name, content) pairs, recording blocks with invalid paths in failed."""
+    for file_name, content in blocks:
+        try:
+            name = _archive_name(file_name)
+        except ValueError as e:
+            failed.append((file_name, str(e)))
+            continue
+        yield name, content
+
+def _as_bytes(content) -> bytes:
+    return content.encode('utf-8') if isinstance(content, str) else content
+
+class VirtualFS:
+    """An in-memory path -> bytes mapping of extracted solution files.
+
+    Blocks given to the constructor with invalid paths are skipped and
+    listed in `failed` as (path, error) pairs.
+    """
+
+    def __init__(self, blocks=()):
+        self.files = {}
+        self.failed = []
+        for name, content in _archive_entries(blocks, self.failed):
+            self.files[name] = _as_bytes(content)
+
+    def write(self, file_name: str, content) -> None:
+        """Stores content at file_name; raises ValueError for an invalid path."""
+        self.files[_archive_name(file_name)] = _as_bytes(content)
+
+    def read(self, file_name: str) -> bytes:
+        return self.files[_archive_name(file_name)]
+
+    def exists(self, file_name: str) -> bool:
+        return self.isfile(file_name) or self.isdir(file_name)
+
+    def isfile(self, file_name: str) -> bool:
+        return _archive_name(file_name) in self.files
+
+    def isdir(self, path: str) -> bool:
+        prefix = self._prefix(path)
+        return any(name.startswith(prefix) for name in self.files)
+
+    def listdir(self, path: str = '') -> list[str]:
+        """Lists the files and directories directly under path."""
+        prefix = self._prefix(path)
+        entries = set()
+        for name in self.files:
+            if name.startswith(prefix):
+                entries.add(name[len(prefix):].split('/', 1)[0])
+        if not entries and prefix:
+            raise FileNotFoundError(f"No such directory: {path!r}")
+        return sorted(entries)
+
+    def items(self):
+        return self.files.items()
+
+    def __iter__(self):
+        return iter(self.files)
+
+    def __len__(self):
+        return len(self.files)
+
+    def __contains__(self, file_name):
+        return self.isfile(file_name)
+
+    @staticmethod
+    def _prefix(path: str) -> str:
+        path = path.replace('\\', '/').strip('/')
+        return f"{path}/" if path and path != '.' else ''
+
+def write_zip(blocks, target, compression=zipfile.ZIP_DEFLATED, mtime=None) -> list[tuple[str, str]]:
+    """Streams (file_path, content) pairs into a zip archive.
+
+    target is a path or a binary file object, which does not need to be seekable.
+    Returns the (path, error) pairs of blocks skipped for an invalid path.
+    """
+    failed = []
+    date_time = time.localtime(time.time() if mtime is None else mtime)[:6]
+    with zipfile.ZipFile(target, 'w', compression=compression) as archive:
+        for name, content in _archive_entries(blocks, failed):
+            info = zipfile.ZipInfo(name, date_time)
+            info.compress_type = compression
+            info.external_attr = 0o644 << 16
+            archive.writestr(info, _as_bytes(content))
+    return failed
+
+def write_tar(blocks, target, compression='gz', mtime=None) -> list[tuple[str, str]]:
+    """Streams (file_path, content) pairs into a tar archive.
+
+    target is a path or a binary file object; compression is '', 'gz', 'bz2' or 'xz'.
+    Returns the (path, error) pairs of blocks skipped for an invalid path.
+    """
+    failed = []
+    mode = f"w|{compression}"
+    mtime = time.time() if mtime is None else mtime
+    if isinstance(target, (str, bytes)) or hasattr(target, '__fspath__'):
+        archive = tarfile.open(target, mode)
+    else:
+        archive = tarfile.open(fileobj=target, mode=mode)
+
+    with archive:
+        for name, content in _archive_entries(blocks, failed):
+            data = _as_bytes(content)
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = mtime
+            info.mode = 0o644
+            archive.addfile(info, io.BytesIO(data))
+    return failed
+
+def main():
+    parser = argparse.ArgumentParser(description='Package the files extracted from an LLM response into an archive.')
+    parser.add_argument('response', help='File holding the LLM response')
+    parser.add_argument('--output', default='-', help="Archive path, or '-' for stdout (default: -)")
+    parser.add_argument('--format', choices=['zip', 'tar', 'tar.gz'], default='tar.gz', help='Archive format (default: tar.gz)')
+
+    args = parser.parse_args()
+
+    blocks = extract_solution_from_file(args.response)
+
+    target = sys.stdout.buffer if args.output == '-' else args.output
+    if args.format == 'zip':
+        failed = write_zip(blocks, target)
+    else:
+        failed = write_tar(blocks, target, compression='gz' if args.format == 'tar.gz' else '')
+
+    # stdout may hold the archive, so report on stderr
+    for file_name, error in failed:
+        print(f"Skipping block: {error}", file=sys.stderr)
+
+    if args.output != '-':
+        print(f"{len(blocks) - len(failed)} files written to: {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import os
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+# Solutions with at least this many files are written from a thread pool
+PARALLEL_THRESHOLD = 16
+
+def normalize_path(file_name: str) -> str:
+    """Returns file_name as a clean relative path, rejecting paths outside the root."""
+    path = os.path.normpath(file_name.replace('\\', '/'))
+    if os.path.isabs(path) or path in ('.', '..') or path.startswith('..' + os.sep):
+        raise ValueError(f"Invalid solution path: {file_name!r}")
+    return path
+
+def _current_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+def _write_file(path: str, data: bytes, mode: int) -> bool:
+    """Atomically writes data to path; returns False if it already held that content."""
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, 'rb') as f:
+                if hashlib.sha256(f.read()).digest() == hashlib.sha256(data).digest():
+                    return False
+    except FileNotFoundError:
+        pass
+
+    directory, name = os.path.split(path)
+    fd, temp_path = tempfile.mkstemp(dir=directory or '.', prefix=f'.{name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return True
+
+def write_solution(
+    blocks: list[tuple[str, str]],
+    root: str = '.',
+    max_workers: int = None
+) -> dict[str, list]:
+    """Writes extracted (file_path, file_content) tuples under root.
+
+    Each directory is created once, files whose content is unchanged are left
+    untouched (so file watchers are not triggered) and every write goes
+    through a temporary file and a rename.
+
+    Returns:
+        A dict with the 'written' and 'unchanged' paths and the 'failed'
+        (path, error) pairs.
+    """
+    summary = {'written': [], 'unchanged': [], 'failed': []}
+
+    # Later blocks for the same path win, as with sequential writes
+    files = {}
+    for file_name, code in blocks:
+        try:
+            path = normalize_path(file_name)
+        except ValueError as e:
+            summary['failed'].append((file_name, str(e)))
+            continue
+        files[path] = code.encode('utf-8')
+
+    for directory in sorted({os.path.dirname(path) for path in files}):
+        if directory:
+            try:
+                os.makedirs(os.path.join(root, directory), exist_ok=True)
+            except OSError:
+                # Reported as a failure of each file in that directory
+                pass
+
+    mode = 0o666 & ~_current_umask()
+
+    def write(item):
+        path, data = item
+        try:
+            changed = _write_file(os.path.join(root, path), data, mode)
+        except OSError as e:
+            return path, e
+        return path, changed
+
+    if len(files) >= PARALLEL_THRESHOLD:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(write, files.items()))
+    else:
+        results = [write(item) for item in files.items()]
+
+    for path, outcome in results:
+        if isinstance(outcome, Exception):
+            summary['failed'].append((path, str(outcome)))
+        elif outcome:
+            summary['written'].append(path)
+        else:
+            summary['unchanged'].append(path)
+
+    return summary
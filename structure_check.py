@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import sys
+import json
+import argparse
+
+from extract_solution import extract_solution_from_file
+
+SCRIPT_EXTENSIONS = {'.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs'}
+JSX_EXTENSIONS = {'.tsx', '.jsx'}
+
+# Files a submission cannot run without
+REQUIRED_FILES = ('src/main.tsx',)
+
+# After these words an expression starts, so '/' begins a regex and '<' a JSX tag
+EXPRESSION_KEYWORDS = {
+    'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+    'throw', 'case', 'do', 'else', 'yield', 'await',
+}
+
+OPENERS = {')': '(', ']': '[', '}': '{'}
+
+MAX_ISSUES = 20
+
+_WHITESPACE = re.compile(r'\s+')
+_WORD = re.compile(r'[\w$]+')
+_TEMPLATE_STOP = re.compile(r'[\\`$]')
+_JSX_TEXT_STOP = re.compile(r'[<{]')
+_TAG_STOP = re.compile(r'["\'{/>]')
+_TAG_NAME = re.compile(r'\s*([A-Za-z_$][\w.:$-]*)?')
+_CLOSING_TAG = re.compile(r'</\s*([A-Za-z_$][\w.:$-]*)?\s*>')
+# What tells a generic arrow's `<T,>` or `<T extends X>` apart from a JSX tag
+_TYPE_PARAMETERS = re.compile(r'\s*,|\s+extends\b')
+
+def _skip_type_parameters(source: str, position: int) -> int:
+    """Returns the index after the '>' closing the type parameter list opened at position."""
+    depth = 0
+    for i in range(position, len(source)):
+        c = source[i]
+        if c == '<':
+            depth += 1
+        elif c == '>' and source[i - 1] != '=':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return len(source)
+
+def _line(source: str, position: int) -> int:
+    return source.count('\n', 0, position) + 1
+
+def _describe(source: str, entry) -> str:
+    kind, position, name = entry
+    if kind == 'tag':
+        return f"tag <{name or ''}"
+    if kind == 'elem':
+        return f"element <{name or ''}>"
+    if kind == '`':
+        return "template literal"
+    return f"'{kind[0]}'"
+
+def check_source(source: str, jsx: bool = False) -> list[tuple[int, str]]:
+    """Finds structural errors in TS/JS source with a single streaming scan.
+
+    Strings, template literals, comments, regex literals and, with jsx=True,
+    JSX tags and text are tokenized well enough to check that brackets and
+    elements are balanced and that nothing is left unterminated.
+
+    Returns:
+        A list of (line, message) tuples, empty if the source looks sound.
+    """
+    issues = []
+    # Entries are (kind, position, tag name); kind is a bracket, '`', '${',
+    # '{jsx' (an expression inside JSX), 'tag' (inside <...>) or 'elem' (children)
+    stack = []
+    expression = True
+    i, n = 0, len(source)
+
+    def report(position, message):
+        issues.append((_line(source, position), message))
+
+    def after_element():
+        # A finished element is a value unless it is the child of another one
+        nonlocal expression
+        expression = False
+
+    while i < n and len(issues) < MAX_ISSUES:
+        kind = stack[-1][0] if stack else None
+
+        if kind == '`':
+            match = _TEMPLATE_STOP.search(source, i)
+            if not match:
+                i = n
+                break
+            i = match.start()
+            c = source[i]
+            if c == '\\':
+                i += 2
+            elif c == '`':
+                stack.pop()
+                i += 1
+                expression = False
+            elif source.startswith('${', i):
+                stack.append(('${', i, None))
+                i += 2
+                expression = True
+            else:
+                i += 1
+            continue
+
+        if kind == 'elem':
+            match = _JSX_TEXT_STOP.search(source, i)
+            if not match:
+                i = n
+                break
+            i = match.start()
+            if source[i] == '{':
+                stack.append(('{jsx', i, None))
+                i += 1
+                expression = True
+                continue
+            if source.startswith('</', i):
+                match = _CLOSING_TAG.match(source, i)
+                if not match:
+                    report(i, "Malformed closing tag")
+                    i += 2
+                    continue
+                name, opened = match.group(1), stack[-1]
+                if name != opened[2]:
+                    report(i, f"Closing tag </{name or ''}> does not match <{opened[2] or ''}> "
+                              f"opened on line {_line(source, opened[1])}")
+                stack.pop()
+                i = match.end()
+                after_element()
+                continue
+            match = _TAG_NAME.match(source, i + 1)
+            stack.append(('tag', i, match.group(1)))
+            i = match.end()
+            continue
+
+        if kind == 'tag':
+            match = _TAG_STOP.search(source, i)
+            if not match:
+                i = n
+                break
+            i = match.start()
+            c = source[i]
+            if c in '"\'':
+                end = source.find(c, i + 1)
+                if end == -1:
+                    report(i, "Unterminated attribute string")
+                    i = n
+                    break
+                i = end + 1
+            elif c == '{':
+                stack.append(('{jsx', i, None))
+                i += 1
+                expression = True
+            elif c == '>':
+                _, position, name = stack.pop()
+                stack.append(('elem', position, name))
+                i += 1
+            elif source.startswith('/>', i):
+                stack.pop()
+                i += 2
+                after_element()
+            else:
+                i += 1
+            continue
+
+        # Regular code
+        c = source[i]
+        if c.isspace():
+            i = _WHITESPACE.match(source, i).end()
+            continue
+
+        if c == '/':
+            following = source[i + 1:i + 2]
+            if following == '/':
+                end = source.find('\n', i)
+                i = n if end == -1 else end
+            elif following == '*':
+                end = source.find('*/', i + 2)
+                if end == -1:
+                    report(i, "Unterminated block comment")
+                    i = n
+                else:
+                    i = end + 2
+            elif expression:
+                # Regex literal; a '/' inside a character class does not end it
+                j, in_class = i + 1, False
+                while j < n:
+                    ch = source[j]
+                    if ch == '\\':
+                        j += 2
+                        continue
+                    if ch == '\n':
+                        break
+                    if in_class:
+                        in_class = ch != ']'
+                    elif ch == '[':
+                        in_class = True
+                    elif ch == '/':
+                        break
+                    j += 1
+                if j >= n or source[j] != '/':
+                    report(i, "Unterminated regular expression")
+                    i = j
+                else:
+                    i = _WORD.match(source, j + 1).end() if _WORD.match(source, j + 1) else j + 1
+                expression = False
+            else:
+                i += 1
+                expression = True
+            continue
+
+        if c in '"\'':
+            j = i + 1
+            while j < n:
+                ch = source[j]
+                if ch == '\\':
+                    j += 2
+                    continue
+                if ch == c or ch == '\n':
+                    break
+                j += 1
+            if j >= n or source[j] != c:
+                report(i, "Unterminated string")
+                i = j
+            else:
+                i = j + 1
+            expression = False
+            continue
+
+        if c == '`':
+            stack.append(('`', i, None))
+            i += 1
+            continue
+
+        if c in '([{':
+            stack.append((c, i, None))
+            i += 1
+            expression = True
+            continue
+
+        if c in ')]}':
+            if c == '}' and kind in ('${', '{jsx'):
+                stack.pop()
+            elif kind == OPENERS[c]:
+                stack.pop()
+            else:
+                # Recover by closing up to a matching opener, if there is one
+                depth = next((d for d in range(len(stack) - 1, -1, -1)
+                              if stack[d][0] in ('(', '[', '{', '${', '{jsx')
+                              and (stack[d][0] == OPENERS[c] or c == '}' and stack[d][0] in ('${', '{jsx'))), None)
+                if depth is None:
+                    report(i, f"Unmatched '{c}'")
+                else:
+                    for entry in reversed(stack[depth + 1:]):
+                        report(entry[1], f"Unclosed {_describe(source, entry)} before '{c}' on line {_line(source, i)}")
+                    del stack[depth:]
+            i += 1
+            expression = c == '}'
+            continue
+
+        if jsx and c == '<' and expression:
+            match = _TAG_NAME.match(source, i + 1)
+            if match.group(1) and _TYPE_PARAMETERS.match(source, match.end()):
+                i = _skip_type_parameters(source, i)
+                expression = False
+                continue
+            if match.group(1) or source.startswith('>', match.end()):
+                stack.append(('tag', i, match.group(1)))
+                i = match.end()
+                continue
+
+        match = _WORD.match(source, i)
+        if match:
+            expression = match.group() in EXPRESSION_KEYWORDS
+            i = match.end()
+            continue
+
+        i += 1
+        expression = True
+
+    for entry in reversed(stack):
+        if len(issues) >= MAX_ISSUES:
+            break
+        report(entry[1], f"Unclosed {_describe(source, entry)}")
+
+    return issues
+
+def check_file(file_name: str, code: str) -> list[tuple[int, str]]:
+    """Checks one extracted file; file types without a checker only fail when empty."""
+    if not code.strip():
+        return [(1, "Empty file")]
+
+    ext = os.path.splitext(file_name)[1].lower()
+    if ext in SCRIPT_EXTENSIONS:
+        return check_source(code, jsx=ext in JSX_EXTENSIONS)
+    if ext == '.json':
+        try:
+            json.loads(code)
+        except ValueError as e:
+            return [(getattr(e, 'lineno', 1), f"Invalid JSON: {e}")]
+    return []
+
+def check_solution(blocks: list[tuple[str, str]], required=REQUIRED_FILES) -> dict[str, list[tuple[int, str]]]:
+    """Checks extract_solution output; returns the issues of each broken file."""
+    issues = {}
+    files = {}
+    for file_name, code in blocks:
+        files[file_name] = code
+
+    for file_name in required:
+        if file_name not in files:
+            issues[file_name] = [(0, "Missing file")]
+
+    for file_name, code in files.items():
+        file_issues = check_file(file_name, code)
+        if file_issues:
+            issues[file_name] = file_issues
+    return issues
+
+def main():
+    parser = argparse.ArgumentParser(description='Reject LLM responses whose extracted files are structurally broken.')
+    parser.add_argument('response', help='File holding the LLM response')
+
+    args = parser.parse_args()
+
+    issues = check_solution(extract_solution_from_file(args.response))
+    for file_name, file_issues in issues.items():
+        for line, message in file_issues:
+            print(f"{file_name}:{line}: {message}")
+
+    if issues:
+        sys.exit(1)
+    print("No structural issues found.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import time
+import argparse
+import threading
+from contextlib import contextmanager
+
+class Tracer:
+    """Records timed pipeline stages as Chrome trace events.
+
+    Open the saved file in chrome://tracing or Perfetto. Each lane (e.g. a
+    job id) is shown as its own row.
+    """
+
+    def __init__(self):
+        self.events = []
+        self._origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, lane=None, **args):
+        """Times the enclosed block as the stage name."""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            event = {
+                'name': name,
+                'ph': 'X',
+                'ts': (start - self._origin) / 1000,
+                'dur': (end - start) / 1000,
+                'pid': os.getpid(),
+                'tid': threading.get_ident() if lane is None else str(lane),
+            }
+            if args:
+                event['args'] = args
+            with self._lock:
+                self.events.append(event)
+
+    def to_chrome_trace(self) -> dict:
+        return {'traceEvents': list(self.events), 'displayTimeUnit': 'ms'}
+
+    def save(self, trace_file: str) -> None:
+        with open(trace_file, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+def percentile(values: list[float], p: float) -> float:
+    """Linearly interpolated percentile of values, p in [0, 100]."""
+    values = sorted(values)
+    if not values:
+        return 0.0
+    position = (len(values) - 1) * p / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+def summarize(events: list[dict], percentiles=(50, 90, 99)) -> dict[str, dict]:
+    """Per-stage count, mean, percentiles and max of durations, in seconds."""
+    durations = {}
+    for event in events:
+        if event.get('ph') == 'X':
+            durations.setdefault(event['name'], []).append(event['dur'] / 1e6)
+
+    summary = {}
+    for name, values in durations.items():
+        stats = {'count': len(values), 'mean': sum(values) / len(values)}
+        for p in percentiles:
+            stats[f'p{p}'] = percentile(values, p)
+        stats['max'] = max(values)
+        summary[name] = stats
+    return summary
+
+def format_summary(summary: dict[str, dict]) -> str:
+    lines = [f"{'stage':<20}{'count':>7}{'mean':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}"]
+    for name, stats in summary.items():
+        lines.append(
+            f"{name:<20}{stats['count']:>7}" +
+            ''.join(f"{stats.get(key, 0.0):>9.3f}s" for key in ('mean', 'p50', 'p90', 'p99', 'max'))
+        )
+    return '\n'.join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarize stage timings of Chrome trace files.')
+    parser.add_argument('traces', nargs='+', help='Trace files written by Tracer.save')
+    parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
+
+    args = parser.parse_args()
+
+    events = []
+    for trace_file in args.traces:
+        with open(trace_file, 'r', encoding='utf-8') as f:
+            events.extend(json.load(f)['traceEvents'])
+
+    summary = summarize(events)
+    print(json.dumps(summary, indent=2) if args.json else format_summary(summary))
+
+if __name__ == "__main__":
+    main()
@@ -8,9 +8,11 @@ export default defineConfig({
     react(),
     tailwindcss(),
   ],
+  // Per-workspace dependency cache when node_modules is shared between workspaces
+  cacheDir: process.env.VITE_CACHE_DIR,
   server: {
     host: true,
-    port: 5173,
+    port: Number(process.env.PORT) || 5173,
     strictPort: true,
   },
 })
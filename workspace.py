@@ -0,0 +1,198 @@
+import os
+import json
+import shutil
+import hashlib
+import threading
+
+from solution_writer import write_solution
+
+# Template entries never copied into a workspace
+TEMPLATE_IGNORE = shutil.ignore_patterns(
+    '.git', 'node_modules', '__pycache__', 'eval', '*.py', '*.jsonl', '*.zip', 'output.txt'
+)
+
+# Workspace entries that survive a reset: linked dependencies and Vite's cache
+PRESERVED = {'node_modules', '.vite'}
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def walk_files(root: str, ignore=None, skip=()):
+    """Yields the relative path of every file under root, in sorted order.
+
+    ignore is a shutil.copytree style callable; skip names top-level
+    directories to leave out.
+    """
+    for directory, dirs, files in os.walk(root):
+        ignored = ignore(directory, dirs + files) if ignore else set()
+        if directory == root:
+            ignored = ignored | set(skip)
+        dirs[:] = sorted(d for d in dirs if d not in ignored)
+        for file in sorted(files):
+            if file not in ignored:
+                yield os.path.relpath(os.path.join(directory, file), root)
+
+class TemplateManifest:
+    """Paths, sizes and hashes of the files of a pristine app template."""
+
+    def __init__(self, root: str, files: dict[str, tuple[int, str]]):
+        self.root = os.path.abspath(root)
+        self.files = files
+
+    @classmethod
+    def build(cls, root: str, ignore=TEMPLATE_IGNORE, skip=()) -> 'TemplateManifest':
+        files = {}
+        for path in walk_files(root, ignore, skip):
+            full_path = os.path.join(root, path)
+            files[path] = (os.path.getsize(full_path), hash_file(full_path))
+        return cls(root, files)
+
+    def directories(self) -> set[str]:
+        directories = set()
+        for path in self.files:
+            directory = os.path.dirname(path)
+            while directory and directory not in directories:
+                directories.add(directory)
+                directory = os.path.dirname(directory)
+        return directories
+
+    def digest(self) -> str:
+        """A hash of the whole template, used as a cache key."""
+        digest = hashlib.sha256()
+        for path in sorted(self.files):
+            digest.update(f"{path}\0{self.files[path][1]}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def save(self, manifest_file: str) -> None:
+        with open(manifest_file, 'w', encoding='utf-8') as f:
+            json.dump({'root': self.root, 'files': self.files}, f)
+
+    @classmethod
+    def load(cls, manifest_file: str) -> 'TemplateManifest':
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['root'], {path: tuple(entry) for path, entry in data['files'].items()})
+
+class Workspace:
+    """A working copy of the template that can be reset to it incrementally."""
+
+    def __init__(self, path: str, manifest: TemplateManifest):
+        self.path = os.path.abspath(path)
+        self.manifest = manifest
+        # path -> (size, mtime_ns) of files known to match the template
+        self._clean = {}
+
+    def create(self) -> None:
+        """Copies the whole template into the workspace."""
+        shutil.rmtree(self.path, ignore_errors=True)
+        for directory in sorted(self.manifest.directories()):
+            os.makedirs(os.path.join(self.path, directory), exist_ok=True)
+        os.makedirs(self.path, exist_ok=True)
+        for path in self.manifest.files:
+            self._restore(path)
+
+    def _restore(self, path: str) -> None:
+        target = os.path.join(self.path, path)
+        shutil.copy2(os.path.join(self.manifest.root, path), target)
+        stat = os.stat(target)
+        self._clean[path] = (stat.st_size, stat.st_mtime_ns)
+
+    def reset(self) -> dict[str, list[str]]:
+        """Restores modified and deleted template files and removes added ones.
+
+        Files whose size and mtime still match the last known clean state are
+        not read, so the cost follows the size of the changes.
+        """
+        changes = {'restored': [], 'removed': []}
+        seen = set()
+
+        for path in walk_files(self.path, skip=PRESERVED):
+            full_path = os.path.join(self.path, path)
+            entry = self.manifest.files.get(path)
+            if entry is None:
+                os.unlink(full_path)
+                changes['removed'].append(path)
+                continue
+
+            seen.add(path)
+            stat = os.stat(full_path)
+            if self._clean.get(path) == (stat.st_size, stat.st_mtime_ns):
+                continue
+            if stat.st_size == entry[0] and hash_file(full_path) == entry[1]:
+                self._clean[path] = (stat.st_size, stat.st_mtime_ns)
+                continue
+            self._restore(path)
+            changes['restored'].append(path)
+
+        for path in self.manifest.files:
+            if path not in seen:
+                os.makedirs(os.path.dirname(os.path.join(self.path, path)), exist_ok=True)
+                self._restore(path)
+                changes['restored'].append(path)
+
+        # Drop directories that only held added files; only parents of removed
+        # files can have been emptied, so the rest of the tree is not walked
+        directories = self.manifest.directories()
+        candidates = set()
+        for path in changes['removed']:
+            directory = os.path.dirname(path)
+            while directory and directory not in directories and directory not in candidates:
+                candidates.add(directory)
+                directory = os.path.dirname(directory)
+        for directory in sorted(candidates, key=lambda path: path.count(os.sep), reverse=True):
+            try:
+                os.rmdir(os.path.join(self.path, directory))
+            except OSError:
+                # Still holds other files
+                pass
+
+        return changes
+
+    def apply(self, blocks: list[tuple[str, str]]) -> dict[str, list]:
+        """Writes a submission's extracted files into the workspace."""
+        return write_solution(blocks, self.path)
+
+class WorkspaceManager:
+    """A pool of reusable workspaces created from one template manifest."""
+
+    def __init__(self, template_dir: str, work_dir: str, ignore=TEMPLATE_IGNORE):
+        self.work_dir = os.path.abspath(work_dir)
+        template_dir = os.path.abspath(template_dir)
+        # The work directory may live inside the template
+        skip = ()
+        if os.path.dirname(self.work_dir) == template_dir:
+            skip = (os.path.basename(self.work_dir),)
+        self.manifest = TemplateManifest.build(template_dir, ignore, skip)
+        self._idle = []
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> tuple[Workspace, bool]:
+        """Returns a pristine workspace and whether it was newly created."""
+        with self._lock:
+            workspace = self._idle.pop() if self._idle else None
+            if workspace is None:
+                self._count += 1
+                path = os.path.join(self.work_dir, f"workspace-{self._count}")
+
+        if workspace is not None:
+            workspace.reset()
+            return workspace, False
+
+        workspace = Workspace(path, self.manifest)
+        workspace.create()
+        return workspace, True
+
+    def release(self, workspace: Workspace) -> None:
+        with self._lock:
+            self._idle.append(workspace)
+
+    def remove_all(self) -> None:
+        with self._lock:
+            for workspace in self._idle:
+                shutil.rmtree(workspace.path, ignore_errors=True)
+            self._idle = []